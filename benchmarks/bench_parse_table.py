@@ -0,0 +1,98 @@
+"""Compare parse_table with the original line-by-line, read_fwf based parser.
+
+    python benchmarks/bench_parse_table.py --stations 30000 --routes 3000 --districts 300
+
+Writes a synthetic Results file with ``pystops.synthetic.write_report``,
+parses each table with both implementations, checks that they agree and
+prints the best of --repeat wall times.
+"""
+import argparse
+import os
+import tempfile
+import time
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+import pystops
+from pystops import synthetic
+from pystops.reader import _table_parameters
+
+
+def original_parse_table(result_file_path, table_label):
+    # parse_table as it was before tables were indexed and converted as arrays
+    def replace_dash(x):
+        return 0 if x == '-' else x
+
+    table_def = _table_parameters[table_label]
+    start_table_tag = 'Table{:>9s}\n'.format(table_def.table_id)
+
+    found_table = False
+    table = StringIO('')
+    with open(result_file_path, 'r') as result_file:
+        for line in result_file:
+            if line.startswith(start_table_tag):
+                found_table = True
+            if found_table:
+                if line.startswith(table_def.end_table_tag):
+                    found_table = False
+                else:
+                    table.write(line)
+    table.seek(0)
+
+    df = pd.read_fwf(table, widths=table_def.widths, skiprows=table_def.skip_rows)
+    if table_def.df_drop_top_rows is not None:
+        df = df[table_def.df_drop_top_rows:]
+    if table_def.df_drop_tail_rows is not None:
+        df = df[:-table_def.df_drop_tail_rows]
+    if table_def.reset_header:
+        df.columns = np.arange(len(df.columns))
+    if table_def.rename_columns is not None:
+        df = df.rename(columns=table_def.rename_columns)
+    if table_def.int_columns is not None or table_def.convert_numerics:
+        df = df.map(replace_dash)
+    if table_def.int_columns is not None:
+        df[table_def.int_columns] = df[table_def.int_columns].astype(np.int64)
+    if table_def.index_col is not None:
+        df = df.set_index(table_def.index_col)
+    if table_def.convert_numerics:
+        df = df.apply(pd.to_numeric)
+    return df.copy()
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stations', type=int, default=30_000)
+    parser.add_argument('--routes', type=int, default=3_000)
+    parser.add_argument('--districts', type=int, default=300)
+    parser.add_argument('--tables', nargs='+', default=['9.01', '10.01', '345.01'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    pystops.disable_cache()
+    with tempfile.TemporaryDirectory() as directory:
+        result_file = os.path.join(directory, 'results.prn')
+        synthetic.write_report(result_file, args.districts, args.routes, args.stations)
+        print(f'{os.path.getsize(result_file) / 1024 ** 2:.1f} MB Results file')
+
+        print(f'{"table":<10s}{"shape":>14s}{"before s":>10s}{"after s":>10s}')
+        for label in args.tables:
+            before, expected = best_time(lambda: original_parse_table(result_file, label), args.repeat)
+            after, table = best_time(lambda: pystops.parse_table(result_file, label), args.repeat)
+            pd.testing.assert_frame_equal(table, expected, check_dtype=False, check_index_type=False)
+            shape = f'{table.shape[0]} x {table.shape[1]}'
+            print(f'{label:<10s}{shape:>14s}{before:>10.3f}{after:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Time the main pystops readers on a synthetic STOPS run.
+
+    python benchmarks/run_benchmarks.py --scale medium
+    python benchmarks/run_benchmarks.py --records 20000000 --stations 5000 --json results.json
+
+The run is written once under --directory and reused while its sizes
+match. Each benchmark reports the best wall time of --repeat runs and the
+peak memory traced by tracemalloc in one extra run, so tracing does not
+skew the timings. With --stages one more run of each benchmark is profiled
+and its per-stage breakdown printed.
+"""
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+import pystops
+from pystops import synthetic
+from pystops.skim_reader import _apply_stop_names, _apply_trip_names, clear_lookups
+
+SCALES = {
+    'small': {'districts': 20, 'routes': 50, 'stations': 200, 'records': 200_000, 'taz': 1_000},
+    'medium': {'districts': 100, 'routes': 300, 'stations': 2_000, 'records': 5_000_000, 'taz': 5_000},
+    'large': {'districts': 400, 'routes': 1_000, 'stations': 5_000, 'records': 30_000_000, 'taz': 20_000},
+}
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def benchmarks(result_file):
+    skim = pystops.read_skim(result_file)
+
+    def names():
+        clear_lookups()
+        named = _apply_stop_names(skim, result_file)
+        _apply_trip_names(named, result_file)
+
+    return {
+        'parse_table 9.01': lambda: pystops.parse_table(result_file, '9.01'),
+        'parse_table 10.01': lambda: pystops.parse_table(result_file, '10.01'),
+        'parse_table 1017.01': lambda: pystops.parse_table(result_file, '1017.01'),
+        'read_skim': lambda: pystops.read_skim(result_file),
+        'read_skim categories': lambda: pystops.read_skim(result_file, strings='category'),
+        'attach names': names,
+        'summarize_access_modes': lambda: pystops.summarize_access_modes(result_file),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    for name in SCALES['small']:
+        parser.add_argument(f'--{name}', type=int, help=f'override the number of {name} of --scale')
+    parser.add_argument('--directory', default=os.path.join('benchmarks', 'synthetic'),
+                        help='where the synthetic run is written')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', action='store_true', help='print the time spent in each stage of a benchmark')
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args(argv)
+
+    sizes = {name: getattr(args, name) or default for name, default in SCALES[args.scale].items()}
+    directory = os.path.join(args.directory, '-'.join(f'{name}{value}' for name, value in sizes.items()))
+    result_file = os.path.join(directory, 'Reports', 'AC_s19#s19#b19_STOPSY2019Results.prn')
+    if not os.path.exists(result_file):
+        print(f'writing synthetic run to {directory}')
+        synthetic.write_run(directory, n_districts=sizes['districts'], n_routes=sizes['routes'],
+                            n_stations=sizes['stations'], n_records=sizes['records'], n_taz=sizes['taz'])
+
+    pystops.disable_cache()
+    results = []
+    print(f'{"benchmark":<24s}{"seconds":>10s}{"peak MB":>10s}')
+    for name, func in benchmarks(result_file).items():
+        seconds, peak = measure(func, args.repeat)
+        results.append({'benchmark': name, 'seconds': seconds, 'peak_bytes': peak})
+        print(f'{name:<24s}{seconds:>10.3f}{peak / 1024 ** 2:>10.1f}')
+        if args.stages:
+            with pystops.profile() as profiler:
+                func()
+            results[-1]['stages'] = profiler.records
+            print(profiler.summary()[['calls', 'seconds', 'bytes_read', 'rows']].to_string(), end='\n\n')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'sizes': sizes, 'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
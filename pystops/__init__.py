@@ -1,2 +1,12 @@
-from .reader import parse_table, summarize_access_modes
-from .skim_reader import read_skim
\ No newline at end of file
+from .cache import disable_cache, enable_cache
+from .compare import SkimComparison, align_skims, compare_skims, iter_skim_comparison
+from .districts import DistrictCube, read_district_cube
+from .matrix import SkimMatrix, TazIndex, read_skim_matrix, skim_matrix
+from .profiling import Profiler, disable_profiling, enable_profiling, get_profiler, profile
+from .reader import index_tables, parse_reports, parse_table, parse_tables, summarize_access_modes
+from .report import StopsReport
+from .skim_reader import (iter_skim, read_all_skims, read_skim, read_stops, read_trips, skim_dictionary,
+                          skim_index, store_as_pandas)
+from .store import convert_skims
+from .tail import ReportTail
+from .usage import UsageIndex, build_usage_index
@@ -0,0 +1,125 @@
+import hashlib
+import os
+
+import pandas as pd
+
+# Bump whenever parsing changes in a way that makes old entries invalid
+_CACHE_VERSION = 1
+
+_cache = None
+
+
+class ResultCache:
+    """Size-bounded on-disk cache of parsed tables and skims.
+
+    Entries are pickled DataFrames keyed by what was read (kind and
+    parameters) and stamped with the size and modification time of every
+    source file involved, so an entry is never served once its source has
+    changed. When the directory grows past ``max_bytes`` the least recently
+    used entries are removed.
+    """
+
+    def __init__(self, directory, max_bytes=2 * 1024 ** 3):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return f'ResultCache({self.directory!r}, max_bytes={self.max_bytes})'
+
+    def _entry_name(self, kind, source_paths, params):
+        slot = repr((_CACHE_VERSION, kind, [os.path.abspath(p) for p in source_paths], sorted(params.items())))
+        stamp = repr([_file_stamp(p) for p in source_paths])
+        slot = hashlib.sha1(slot.encode()).hexdigest()
+        stamp = hashlib.sha1(stamp.encode()).hexdigest()[:16]
+        return slot, f'{slot}-{stamp}.pkl'
+
+    def load(self, kind, source_paths, params):
+        _, name = self._entry_name(kind, source_paths, params)
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            obj = pd.read_pickle(path)
+        except Exception:
+            self._remove(path)
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        return obj
+
+    def store(self, kind, source_paths, params, obj):
+        slot, name = self._entry_name(kind, source_paths, params)
+
+        # Entries for older versions of the same source are now stale
+        for entry in os.listdir(self.directory):
+            if entry.startswith(slot) and entry != name:
+                self._remove(os.path.join(self.directory, entry))
+
+        path = os.path.join(self.directory, name)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        pd.to_pickle(obj, tmp_path, protocol=5)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def entries(self):
+        entries = []
+        for entry in os.listdir(self.directory):
+            if not entry.endswith('.pkl'):
+                continue
+            path = os.path.join(self.directory, entry)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(entries)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def enable_cache(directory, max_bytes=2 * 1024 ** 3):
+    """Cache parsed report tables and skims under ``directory``."""
+    global _cache
+    _cache = ResultCache(directory, max_bytes)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def get_cache():
+    return _cache
@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+from .store import convert_skims, load_manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='pystops', description='Tools for STOPS outputs.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert = commands.add_parser('convert', help='convert a STOPS Skims directory into a column-per-file store')
+    convert.add_argument('skim_directory', help='STOPS Skims directory with .bin/.dcb, stops.txt and trips.txt files')
+    convert.add_argument('store', help='output directory, partitioned by core/scenario/mode/access/period')
+    convert.add_argument('--compress', action='store_true', help='write one compressed columns.npz per skim')
+    convert.add_argument('--force', action='store_true', help='convert every skim, even if unchanged')
+
+    listing = commands.add_parser('list', help='list the partitions in a store')
+    listing.add_argument('store')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        written = convert_skims(args.skim_directory, args.store, args.compress, args.force)
+        for partition in written:
+            print(f'converted {partition}')
+        print(f'{len(written)} converted, {len(load_manifest(args.store)) - len(written)} up to date')
+    elif args.command == 'list':
+        for partition in sorted(load_manifest(args.store)):
+            print(partition)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+from .matrix import DEFAULT_FIELDS
+from .skim_reader import _read_origins, _root_skim_path, read_skim, skim_index
+
+# Edges of the delta histograms; the outer bins catch everything beyond +-30
+DEFAULT_BINS = np.array([-np.inf, -30, -15, -10, -5, -2, -1, 0, 1, 2, 5, 10, 15, 30, np.inf])
+
+SWITCHES = ['to_project', 'from_project', 'stays_on_project', 'never_on_project']
+
+
+class SkimComparison:
+    """Running statistics of a scenario skim against its base.
+
+    ``update`` takes aligned pair frames from ``align_skims`` and folds them
+    into per-field delta statistics, delta histograms, pair status counts
+    and project switch counts, so a comparison can be built up one chunk at
+    a time. ``pairs`` holds the aligned frame when the comparison was not
+    chunked.
+    """
+
+    def __init__(self, fields, base='nobuild', scenario='build', bins=None):
+        self.fields = list(fields)
+        self.base = base
+        self.scenario = scenario
+        self.bins = {field: np.asarray(_field_bins(bins, field), dtype=np.float64) for field in self.fields}
+        self.pairs = None
+
+        self._stats = {field: np.zeros(8) for field in self.fields}
+        for stats in self._stats.values():
+            stats[[3, 4]] = np.inf, -np.inf
+        self._histograms = {field: np.zeros(len(self.bins[field]) - 1, dtype=np.int64) for field in self.fields}
+        self._status = pd.Series(0, index=['both', f'{base}_only', f'{scenario}_only'], dtype=np.int64)
+        self._switches = pd.Series(0, index=SWITCHES, dtype=np.int64)
+
+    def __repr__(self):
+        return f'SkimComparison({self.scenario} vs {self.base}, {self.fields}, {self._status.sum()} pairs)'
+
+    def update(self, pairs):
+        self._status += pairs['status'].value_counts().reindex(self._status.index, fill_value=0)
+        self._switches += pairs['switch'].value_counts().reindex(self._switches.index, fill_value=0)
+
+        for field in self.fields:
+            delta = pairs[f'{field}_delta'].to_numpy(dtype=np.float64)
+            delta = delta[~np.isnan(delta)]
+            if not len(delta):
+                continue
+
+            # count, sum, sum of squares, min, max, decreased, unchanged, increased
+            stats = self._stats[field]
+            stats[0] += len(delta)
+            stats[1] += delta.sum()
+            stats[2] += np.square(delta).sum()
+            stats[3] = min(stats[3], delta.min())
+            stats[4] = max(stats[4], delta.max())
+            stats[5] += np.count_nonzero(delta < 0)
+            stats[6] += np.count_nonzero(delta == 0)
+            stats[7] += np.count_nonzero(delta > 0)
+
+            edges = self.bins[field]
+            slots = np.searchsorted(edges, delta, side='right') - 1
+            slots = slots[(slots >= 0) & (slots < len(edges) - 1)]
+            self._histograms[field] += np.bincount(slots, minlength=len(edges) - 1)
+
+    def summary(self):
+        """Per-field delta statistics over the pairs present in both skims."""
+        rows = {}
+        for field, (count, total, squares, low, high, decreased, unchanged, increased) in self._stats.items():
+            mean = total / count if count else np.nan
+            std = np.sqrt(max(squares / count - mean ** 2, 0) * count / (count - 1)) if count > 1 else np.nan
+            rows[field] = {'count': int(count), 'mean': mean, 'std': std,
+                           'min': low if count else np.nan, 'max': high if count else np.nan,
+                           'decreased': int(decreased), 'unchanged': int(unchanged), 'increased': int(increased)}
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    def distribution(self, field):
+        """Counts of ``field`` deltas per histogram bin (closed on the left)."""
+        index = pd.IntervalIndex.from_breaks(self.bins[field], closed='left', name=f'{field}_delta')
+        return pd.Series(self._histograms[field], index=index, name='pairs')
+
+    def status(self):
+        """Number of O-D pairs with a path in both skims or in only one."""
+        return self._status.copy()
+
+    def switches(self):
+        """Number of O-D pairs by whether their path uses the project (PROJECTFLG) in each skim."""
+        return self._switches.copy()
+
+
+def _field_bins(bins, field):
+    if bins is None:
+        return DEFAULT_BINS
+    if isinstance(bins, dict):
+        return bins.get(field, DEFAULT_BINS)
+    return bins
+
+
+def align_skims(base_skim, scenario_skim, fields=None, base='nobuild', scenario='build'):
+    """Outer-join two skims on their I-J pairs.
+
+    Both skims must have been read with ``strings='codes'``. TAZ codes are
+    mapped onto one shared dictionary, each I-J pair becomes a single int64
+    key and the skims are joined by sorting those keys, without any string
+    comparisons. The result has one row per pair with categorical ``ITAZ``
+    and ``JTAZ``, the base and scenario value and delta of every field, a
+    ``status`` column and a ``switch`` column classifying the pair's
+    ``PROJECTFLG`` in both skims (a missing path counts as not on the
+    project). If a pair appears more than once in a skim its first record
+    is used.
+    """
+    fields = DEFAULT_FIELDS if fields is None else list(fields)
+
+    dictionary = base_skim.attrs['dictionary'].union(scenario_skim.attrs['dictionary'])
+    n = len(dictionary)
+
+    keys, rows = [], []
+    for skim in (base_skim, scenario_skim):
+        remap = dictionary.get_indexer(skim.attrs['dictionary'])
+        skim_keys = remap[skim['ITAZ'].to_numpy()].astype(np.int64) * n + remap[skim['JTAZ'].to_numpy()]
+        skim_keys, first = _unique_first(skim_keys)
+        keys.append(skim_keys)
+        rows.append(first)
+
+    pair_keys, _ = _unique_first(np.concatenate(keys))
+    found = []
+    for skim_keys in keys:
+        if not len(skim_keys):
+            found.append(np.full(len(pair_keys), -1))
+            continue
+        slots = np.minimum(np.searchsorted(skim_keys, pair_keys), len(skim_keys) - 1)
+        found.append(np.where(skim_keys[slots] == pair_keys, slots, -1))
+
+    data = {'ITAZ': pd.Categorical.from_codes(pair_keys // n, categories=dictionary),
+            'JTAZ': pd.Categorical.from_codes(pair_keys % n, categories=dictionary)}
+
+    values = {}
+    for field in fields + ['PROJECTFLG']:
+        for name, skim, skim_rows, slots in zip((base, scenario), (base_skim, scenario_skim), rows, found):
+            column = skim[field].to_numpy()[skim_rows]
+            out = np.full(len(pair_keys), np.nan, dtype=np.result_type(column.dtype, np.float32))
+            out[slots >= 0] = column[slots[slots >= 0]]
+            values[field, name] = out
+        if field != 'PROJECTFLG':
+            data[f'{field}_{base}'] = values[field, base]
+            data[f'{field}_{scenario}'] = values[field, scenario]
+            data[f'{field}_delta'] = values[field, scenario] - values[field, base]
+
+    in_base, in_scenario = found[0] >= 0, found[1] >= 0
+    status = np.where(in_base & in_scenario, 0, np.where(in_base, 1, 2))
+    data['status'] = pd.Categorical.from_codes(status, categories=['both', f'{base}_only', f'{scenario}_only'])
+
+    on_base = np.nan_to_num(values['PROJECTFLG', base]) > 0
+    on_scenario = np.nan_to_num(values['PROJECTFLG', scenario]) > 0
+    switch = np.select([on_scenario & ~on_base, on_base & ~on_scenario, on_base & on_scenario], [0, 1, 2], 3)
+    data[f'PROJECTFLG_{base}'] = values['PROJECTFLG', base]
+    data[f'PROJECTFLG_{scenario}'] = values['PROJECTFLG', scenario]
+    data['switch'] = pd.Categorical.from_codes(switch, categories=SWITCHES)
+
+    return pd.DataFrame(data)
+
+
+def _unique_first(keys):
+    # Sorted unique keys and the first row of each, by a stable sort rather
+    # than np.unique, which hashes and then sorts anyway
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    return keys[first], order[first]
+
+
+def iter_skim_comparison(result_file, mode='fg', access='walk', period='pk', fields=None,
+                         base='nobuild', scenario='build', chunk_origins=500):
+    """Yield ``align_skims`` frames for ``chunk_origins`` origin TAZs at a time.
+
+    Records are pulled per origin through the sidecar index of each skim
+    (see ``skim_index``), so only one chunk of both skims is in memory at a
+    time.
+    """
+    fields = DEFAULT_FIELDS if fields is None else list(fields)
+    columns = ['ITAZ', 'JTAZ'] + fields + ['PROJECTFLG']
+
+    paths = [f'{_root_skim_path(result_file, name, mode, access, period)}.bin' for name in (base, scenario)]
+    origins = np.union1d(*[skim_index(path).origins for path in paths])
+
+    for start in range(0, len(origins), chunk_origins):
+        chunk = origins[start:start + chunk_origins]
+        base_skim, scenario_skim = [_read_origins(path, chunk, columns, strings='codes') for path in paths]
+        yield align_skims(base_skim, scenario_skim, fields, base, scenario)
+
+
+def compare_skims(result_file, mode='fg', access='walk', period='pk', fields=None, base='nobuild',
+                  scenario='build', bins=None, chunk_origins=None):
+    """Compare the ``scenario`` skim with the ``base`` skim of one mode/access/period.
+
+    Returns a ``SkimComparison`` whose ``pairs`` is the full aligned frame
+    from ``align_skims``. With ``chunk_origins`` the skims are compared
+    ``chunk_origins`` origins at a time through ``iter_skim_comparison`` and
+    only the statistics are kept, for skims too large to hold in memory.
+    ``bins`` sets the delta histogram edges, for all fields or per field
+    as a dict.
+    """
+    fields = DEFAULT_FIELDS if fields is None else list(fields)
+    comparison = SkimComparison(fields, base, scenario, bins)
+
+    if chunk_origins is not None:
+        for pairs in iter_skim_comparison(result_file, mode, access, period, fields, base, scenario, chunk_origins):
+            comparison.update(pairs)
+        return comparison
+
+    columns = ['ITAZ', 'JTAZ'] + fields + ['PROJECTFLG']
+    base_skim, scenario_skim = [read_skim(result_file, name, mode, access, period, columns=columns, strings='codes')
+                                for name in (base, scenario)]
+    comparison.pairs = align_skims(base_skim, scenario_skim, fields, base, scenario)
+    comparison.update(comparison.pairs)
+    return comparison
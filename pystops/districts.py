@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from .reader import index_tables, parse_tables
+from .report import StopsReport
+
+SCENARIOS = ['exist', 'nobuild', 'build']
+PURPOSES = ['HBW', 'HBO', 'NHB', 'All']
+AUTO_OWNERSHIP = ['0', '1', '2', 'All']
+
+
+def district_table_label(scenario, purpose, auto_ownership):
+    """Section 15 table label for one scenario, purpose and car ownership.
+
+    The district-to-district transit tables run from 30.01 (existing, HBW,
+    0 car) to 1017.01 (build, all trips, all households) in steps of 21.
+    """
+    position = (SCENARIOS.index(scenario) * len(PURPOSES) * len(AUTO_OWNERSHIP)
+                + PURPOSES.index(purpose) * len(AUTO_OWNERSHIP)
+                + AUTO_OWNERSHIP.index(str(auto_ownership)))
+    return f'{30 + 21 * position}.01'
+
+
+class DistrictCube:
+    """Section 15 district-to-district trips as one dense array.
+
+    ``values`` has axes scenario x purpose x auto ownership x origin x
+    destination, labelled by ``SCENARIOS``, ``PURPOSES``, ``AUTO_OWNERSHIP``,
+    ``origins`` and ``destinations``. O-D pairs a table does not report are 0
+    and tables missing from the Results file are NaN.
+    """
+
+    def __init__(self, values, origins, destinations):
+        self.values = values
+        self.origins = pd.Index(origins, name='origin')
+        self.destinations = pd.Index(destinations, name='destination')
+
+    def __repr__(self):
+        return f'DistrictCube(origins={len(self.origins)}, destinations={len(self.destinations)})'
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def sel(self, scenario=None, purpose=None, auto_ownership=None):
+        """Slice by label. Axes given a single label are dropped, like numpy indexing."""
+        index = (_axis_index(SCENARIOS, scenario),
+                 _axis_index(PURPOSES, purpose),
+                 _axis_index(AUTO_OWNERSHIP, auto_ownership))
+        return self.values[index]
+
+    def difference(self, scenario='build', base='nobuild', purpose=None, auto_ownership=None):
+        """``scenario`` minus ``base`` trips, e.g. build vs no-build."""
+        return (self.sel(scenario, purpose, auto_ownership)
+                - self.sel(base, purpose, auto_ownership))
+
+    def to_frame(self, scenario='build', purpose='All', auto_ownership='All'):
+        """One O-D matrix as a DataFrame, shaped like the parsed table."""
+        return pd.DataFrame(self.sel(scenario, purpose, str(auto_ownership)),
+                            index=self.origins, columns=self.destinations)
+
+    def to_long(self):
+        """Long-format frame with one row per scenario/purpose/auto ownership/O-D."""
+        index = pd.MultiIndex.from_product(
+            [SCENARIOS, PURPOSES, AUTO_OWNERSHIP, self.origins, self.destinations],
+            names=['scenario', 'purpose', 'auto_ownership', 'origin', 'destination'])
+        return pd.DataFrame({'trips': self.values.ravel()}, index=index)
+
+
+def _axis_index(labels, label):
+    if label is None:
+        return slice(None)
+    if isinstance(label, (list, tuple)):
+        return [labels.index(str(item)) for item in label]
+    return labels.index(str(label))
+
+
+def read_district_cube(result_file_path):
+    """Load every Section 15 district-to-district table into a ``DistrictCube``.
+
+    ``result_file_path`` may also be a ``StopsReport``, in which case its
+    memoized tables are used. All 48 tables are read in one pass over the file.
+    """
+    keys = [(scenario, purpose, auto_ownership)
+            for scenario in SCENARIOS for purpose in PURPOSES for auto_ownership in AUTO_OWNERSHIP]
+    labels = {key: district_table_label(*key) for key in keys}
+
+    if isinstance(result_file_path, StopsReport):
+        report = result_file_path
+        tables = report.tables([label for label in labels.values() if label in report])
+    else:
+        table_index = index_tables(result_file_path)
+        tables = parse_tables(result_file_path, [label for label in labels.values() if label in table_index],
+                              table_index)
+
+    tables = {label: _drop_totals(table) for label, table in tables.items()}
+
+    origins = pd.Index([])
+    destinations = pd.Index([])
+    for table in tables.values():
+        origins = origins.append(table.index.difference(origins, sort=False))
+        destinations = destinations.append(table.columns.difference(destinations, sort=False))
+
+    values = np.full((len(SCENARIOS), len(PURPOSES), len(AUTO_OWNERSHIP), len(origins), len(destinations)),
+                     np.nan)
+    for (scenario, purpose, auto_ownership), label in labels.items():
+        if label not in tables:
+            continue
+        table = tables[label].reindex(index=origins, columns=destinations, fill_value=0)
+        values[SCENARIOS.index(scenario), PURPOSES.index(purpose), AUTO_OWNERSHIP.index(auto_ownership)] = \
+            table.to_numpy(dtype=np.float64)
+
+    return DistrictCube(values, origins, destinations)
+
+
+def _drop_totals(table):
+    totals = [col for col in table.columns if str(col).strip().lower() == 'total']
+    return table.drop(columns=totals)
@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+
+from .skim_reader import read_skim
+
+DEFAULT_FIELDS = ['ACC_TIME', 'FG__TIME', 'N__BOARD']
+
+
+class TazIndex:
+    """Maps TAZ labels such as '09001$0001' to matrix positions 0..n-1.
+
+    Share one index between matrices (e.g. build and no-build skims) so
+    their rows and columns line up.
+    """
+
+    def __init__(self, labels):
+        self.labels = pd.Index(labels, dtype=object, name='TAZ')
+        if not self.labels.is_unique:
+            raise ValueError('TAZ labels must be unique')
+
+    def __repr__(self):
+        return f'TazIndex({len(self)} zones)'
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __eq__(self, other):
+        return isinstance(other, TazIndex) and self.labels.equals(other.labels)
+
+    @classmethod
+    def from_skims(cls, *skims):
+        """Sorted union of every ITAZ and JTAZ in ``skims``."""
+        labels = [_distinct(skim[col]) for skim in skims for col in ('ITAZ', 'JTAZ')]
+        if not labels:
+            return cls([])
+        return cls(np.unique(np.concatenate(labels).astype(str)))
+
+    def positions(self, labels):
+        """Matrix positions of ``labels``, -1 for labels not in the index."""
+        if isinstance(getattr(labels, 'dtype', None), pd.CategoricalDtype):
+            labels = pd.Categorical(labels)
+            positions = self.labels.get_indexer(labels.categories.astype(object))
+            return np.where(labels.codes < 0, -1, positions[labels.codes])
+        return self.labels.get_indexer(np.asarray(labels, dtype=object))
+
+
+def _distinct(column):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        codes = column.cat.codes.to_numpy()
+        return np.asarray(column.cat.categories, dtype=object)[np.unique(codes[codes >= 0])]
+    return np.asarray(pd.unique(np.asarray(column, dtype=object)))
+
+
+class SkimMatrix:
+    """Skim fields laid out as O-D matrices over a ``TazIndex``.
+
+    Fields are stored either as dense ``n x n`` arrays or, when few O-D
+    pairs have a path, as CSR: ``indptr`` and ``indices`` give the
+    destinations of each origin in sorted order, and each field holds one
+    value per stored pair. Pairs without a path read as NaN.
+    """
+
+    def __init__(self, taz_index, fields, indptr=None, indices=None):
+        self.taz_index = taz_index
+        self.fields = fields
+        self.indptr = indptr
+        self.indices = indices
+        self._keys = None
+
+    def __repr__(self):
+        layout = 'dense' if self.is_dense else f'sparse, {self.nnz} pairs'
+        return f'SkimMatrix({len(self.taz_index)} zones, {list(self.fields)}, {layout})'
+
+    def __getitem__(self, field):
+        return self.dense(field)
+
+    @property
+    def is_dense(self):
+        return self.indptr is None
+
+    @property
+    def nnz(self):
+        if self.is_dense:
+            return int(np.count_nonzero(~np.isnan(next(iter(self.fields.values())))))
+        return len(self.indices)
+
+    @property
+    def shape(self):
+        return len(self.taz_index), len(self.taz_index)
+
+    def dense(self, field):
+        """``field`` as an ``n x n`` array, NaN where there is no path."""
+        values = self.fields[field]
+        if self.is_dense:
+            return values
+        matrix = np.full(self.shape[0] * self.shape[1], np.nan, dtype=values.dtype)
+        matrix[self._linear_keys()] = values
+        return matrix.reshape(self.shape)
+
+    def to_dense(self):
+        if self.is_dense:
+            return self
+        return SkimMatrix(self.taz_index, {field: self.dense(field) for field in self.fields})
+
+    def row(self, origin, field):
+        """Destinations with a path from ``origin`` and their ``field`` values."""
+        i = self.taz_index.positions([origin])[0]
+        if i < 0:
+            raise KeyError(origin)
+        if self.is_dense:
+            values = self.fields[field][i]
+            has_path = ~np.isnan(values)
+            return pd.Series(values[has_path], index=self.taz_index.labels[has_path], name=field)
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return pd.Series(self.fields[field][start:stop], index=self.taz_index.labels[self.indices[start:stop]],
+                         name=field)
+
+    def lookup(self, origins, destinations, fields=None):
+        """Values for many O-D pairs at once.
+
+        ``origins`` and ``destinations`` are equal-length sequences of TAZ
+        labels. Returns an array for a single field name, otherwise a
+        DataFrame with one column per field. Pairs without a path, or with
+        a TAZ not in the index, are NaN.
+        """
+        single = isinstance(fields, str)
+        if fields is None:
+            fields = list(self.fields)
+        elif single:
+            fields = [fields]
+
+        i = self.taz_index.positions(origins)
+        j = self.taz_index.positions(destinations)
+        if len(i) != len(j):
+            raise ValueError('origins and destinations must have the same length')
+        known = (i >= 0) & (j >= 0)
+
+        if self.is_dense:
+            found = known
+            take = (i[known], j[known])
+        else:
+            n = len(self.taz_index)
+            keys = self._linear_keys()
+            wanted = i[known].astype(np.int64) * n + j[known]
+            slots = np.minimum(np.searchsorted(keys, wanted), max(len(keys) - 1, 0))
+            hit = keys[slots] == wanted if len(keys) else np.zeros(len(wanted), dtype=bool)
+            found = known.copy()
+            found[known] = hit
+            take = slots[hit]
+
+        result = {}
+        for field in fields:
+            values = self.fields[field]
+            out = np.full(len(i), np.nan, dtype=values.dtype)
+            out[found] = values[take]
+            result[field] = out
+
+        if single:
+            return result[fields[0]]
+        return pd.DataFrame(result)
+
+    def save(self, path):
+        """Write the matrix to a NumPy ``.npz`` file, see ``SkimMatrix.load``."""
+        arrays = {'taz': self.taz_index.labels.to_numpy(dtype=str),
+                  'field_names': np.array(list(self.fields), dtype=str)}
+        if not self.is_dense:
+            arrays['indptr'] = self.indptr
+            arrays['indices'] = self.indices
+        for k, values in enumerate(self.fields.values()):
+            arrays[f'field_{k}'] = values
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            taz_index = TazIndex(npz['taz'].astype(object))
+            fields = {name: npz[f'field_{k}'] for k, name in enumerate(npz['field_names'].tolist())}
+            if 'indptr' in npz:
+                return cls(taz_index, fields, npz['indptr'], npz['indices'])
+            return cls(taz_index, fields)
+
+    def _linear_keys(self):
+        # Row-major position of every stored pair; sorted because CSR is
+        if self._keys is None:
+            n = len(self.taz_index)
+            rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+            self._keys = rows * n + self.indices
+        return self._keys
+
+
+def skim_matrix(skim, fields=None, taz_index=None, sparse=None, max_density=0.25):
+    """Scatter skim fields into a ``SkimMatrix``.
+
+    ``skim`` is a frame from ``read_skim`` with ``ITAZ`` and ``JTAZ``
+    columns. ``fields`` defaults to ``DEFAULT_FIELDS``. The TAZ index is
+    built from the skim unless ``taz_index`` is given, in which case pairs
+    with a TAZ outside it are dropped. With ``sparse`` left as None the
+    matrix is stored sparse when fewer than ``max_density`` of all O-D
+    pairs have a path. If an O-D pair appears more than once, its first
+    record is kept. Values are stored as floats so missing pairs can be NaN.
+    """
+    if fields is None:
+        fields = DEFAULT_FIELDS
+    elif isinstance(fields, str):
+        fields = [fields]
+    if taz_index is None:
+        taz_index = TazIndex.from_skims(skim)
+
+    n = len(taz_index)
+    i = taz_index.positions(skim['ITAZ'])
+    j = taz_index.positions(skim['JTAZ'])
+    known = (i >= 0) & (j >= 0)
+
+    keys = i[known].astype(np.int64) * n + j[known]
+    keys, first = np.unique(keys, return_index=True)
+    rows = np.flatnonzero(known)[first]
+
+    values = {}
+    for field in fields:
+        column = skim[field].to_numpy()
+        dtype = np.result_type(column.dtype, np.float32)
+        values[field] = column[rows].astype(dtype, copy=False)
+
+    if sparse is None:
+        sparse = n > 0 and len(keys) < max_density * n * n
+
+    if not sparse:
+        dense = {}
+        for field, field_values in values.items():
+            matrix = np.full(n * n, np.nan, dtype=field_values.dtype)
+            matrix[keys] = field_values
+            dense[field] = matrix.reshape(n, n)
+        return SkimMatrix(taz_index, dense)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // n, minlength=n), out=indptr[1:])
+    indices = (keys % n).astype(np.int32 if n <= np.iinfo(np.int32).max else np.int64)
+    return SkimMatrix(taz_index, values, indptr, indices)
+
+
+def read_skim_matrix(result_file, scenario='build', mode='fg', access='walk', period='pk', fields=None,
+                     taz_index=None, sparse=None, max_density=0.25):
+    """Read a skim straight into a ``SkimMatrix``, loading only the needed fields."""
+    if fields is None:
+        fields = DEFAULT_FIELDS
+    elif isinstance(fields, str):
+        fields = [fields]
+    skim = read_skim(result_file, scenario, mode, access, period,
+                     columns=['ITAZ', 'JTAZ'] + list(fields), strings='category')
+    return skim_matrix(skim, fields, taz_index, sparse, max_density)
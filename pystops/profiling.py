@@ -0,0 +1,159 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+FIELDS = ['stage', 'parent', 'path', 'label', 'seconds', 'bytes_read', 'rows', 'peak_bytes']
+
+_profiler = None
+
+
+class Profiler:
+    """Per-stage timings of table parsing and skim loading.
+
+    Every instrumented stage appends one record with its ``stage`` name,
+    the enclosing ``parent`` stage, the ``path`` and table ``label`` it
+    worked on, wall ``seconds``, ``bytes_read`` from disk and ``rows``
+    produced where they apply, and with ``trace_memory`` the ``peak_bytes``
+    allocated above what was in use when the stage started (traced with
+    tracemalloc, which slows reading down noticeably). Records are plain
+    dicts in ``records``, and ``callback`` is called with each one as it is
+    added, e.g. to write a structured log.
+
+    Stages run in worker threads are recorded too, and so are those of the
+    worker processes of ``parse_reports``, though not those of
+    ``read_all_skims(..., use_processes=True)``.
+    """
+
+    def __init__(self, trace_memory=False, callback=None):
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+
+    def __repr__(self):
+        return f'Profiler({len(self.records)} records, trace_memory={self.trace_memory})'
+
+    def to_frame(self):
+        return pd.DataFrame(self.records, columns=FIELDS)
+
+    def summary(self):
+        """Calls, total seconds, bytes read and rows, and the largest peak per stage."""
+        def total(values):
+            return values.sum(min_count=1)
+
+        return self.to_frame().groupby('stage', sort=False).agg(
+            calls=('seconds', 'size'), seconds=('seconds', 'sum'), bytes_read=('bytes_read', total),
+            rows=('rows', total), peak_bytes=('peak_bytes', 'max'))
+
+    def clear(self):
+        with self._lock:
+            self.records = []
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, record):
+        with self._lock:
+            self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+
+class _Frame:
+    def __init__(self, stage, path, label):
+        self.stage = stage
+        self.path = path
+        self.label = label
+        self.bytes_read = None
+        self.rows = None
+        self.start_memory = 0
+        self.peak_memory = 0
+
+
+@contextmanager
+def _stage(stage, path=None, label=None):
+    # Yields a frame whose bytes_read and rows the stage fills in
+    profiler = _profiler
+    if profiler is None:
+        yield _Frame(stage, path, label)
+        return
+
+    stack = profiler._stack()
+    parent = stack[-1] if stack else None
+    frame = _Frame(stage, path if path is not None or parent is None else parent.path,
+                   label if label is not None or parent is None else parent.label)
+
+    tracing = profiler.trace_memory and tracemalloc.is_tracing()
+    if tracing:
+        # tracemalloc keeps one peak, so fold it into the parent before
+        # resetting it for this stage
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent.peak_memory = max(parent.peak_memory, peak)
+        tracemalloc.reset_peak()
+        frame.start_memory = frame.peak_memory = current
+
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        peak_bytes = None
+        if tracing:
+            frame.peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+            if parent is not None:
+                parent.peak_memory = max(parent.peak_memory, frame.peak_memory)
+            peak_bytes = frame.peak_memory - frame.start_memory
+
+        profiler._add({'stage': stage, 'parent': parent.stage if parent is not None else None,
+                       'path': frame.path, 'label': frame.label, 'seconds': seconds,
+                       'bytes_read': frame.bytes_read, 'rows': frame.rows, 'peak_bytes': peak_bytes})
+
+
+def enable_profiling(trace_memory=False, callback=None):
+    """Record the stages of every table parse and skim read from now on, see ``Profiler``."""
+    global _profiler
+    _profiler = Profiler(trace_memory, callback)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _profiler._started_tracing = True
+    return _profiler
+
+
+def disable_profiling():
+    global _profiler
+    if _profiler is not None and _profiler._started_tracing:
+        tracemalloc.stop()
+    _profiler = None
+
+
+def get_profiler():
+    return _profiler
+
+
+@contextmanager
+def profile(trace_memory=False, callback=None):
+    """Profile the reads made inside the ``with`` block.
+
+        with pystops.profile() as profiler:
+            pystops.read_skim(report_file, apply_stop_name=True)
+        profiler.summary()
+    """
+    global _profiler
+    previous = _profiler
+    profiler = enable_profiling(trace_memory, callback)
+    try:
+        yield profiler
+    finally:
+        disable_profiling()
+        _profiler = previous
@@ -1,8 +1,17 @@
-from io import StringIO
+import glob
+import locale
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 
 import numpy as np
 import pandas as pd
 
+from .cache import disable_cache, enable_cache, get_cache
+from .profiling import _stage, get_profiler, profile
+from .skim_reader import _scenario_names
+
 
 class TableDef:
 
@@ -361,66 +370,482 @@ _table_parameters = {
 }
 
 
-def parse_table(result_file_path, table_label):
-    def replace_dash(x):
-        return 0 if x == '-' else x
+def index_tables(result_file_path):
+    """Scan a STOPS Results file once and locate every table block.
+
+    Returns a dict mapping each table label found in the file to a list of
+    ``(offset, length)`` byte spans. Tables listed in ``_table_parameters``
+    end at their ``end_table_tag``; any other table runs up to the next table
+    header. A label that appears more than once gets one span per block.
+
+    The file is memory-mapped and searched for headers and end tags at the
+    bytes level, so large files are never iterated line by line in Python.
+    """
+    with _stage('index', result_file_path) as stage, open(result_file_path, 'rb') as result_file, \
+            _map_file(result_file) as data:
+        stage.bytes_read = len(data)
+        return _index_buffer(data)
+
+
+def _index_buffer(data):
+    spans = {}
+    open_tables = {}
+    closed_at = {}
+
+    for offset in _line_starts(data, b'Table'):
+        line_end = data.find(b'\n', offset)
+        if line_end < 0:
+            break
+        label = _start_table_label(data[offset:line_end + 1])
+        if label is None:
+            continue
+
+        # Tables without a definition run until the next header
+        for open_label in list(open_tables):
+            start = open_tables.pop(open_label)
+            spans[open_label].append((start, offset - start))
+
+        spans.setdefault(label, [])
+        if label not in _table_parameters:
+            open_tables[label] = offset
+        elif offset > closed_at.get(label, -1):
+            # Repeated headers inside an unfinished block are part of it
+            end = _find_line_start(data, _table_parameters[label].end_table_tag.encode(), offset)
+            if end < 0:
+                end = len(data)
+            spans[label].append((offset, end - offset))
+            closed_at[label] = end
+
+    for open_label, start in open_tables.items():
+        spans[open_label].append((start, len(data) - start))
+
+    return spans
+
+
+def _line_starts(data, prefix, start=0, end=None):
+    """Offsets of lines in ``data[start:end]`` starting with ``prefix``.
+
+    ``start`` must itself be the start of a line.
+    """
+    end = len(data) if end is None else end
+    if data[start:start + len(prefix)] == prefix:
+        yield start
+    position = data.find(b'\n' + prefix, start, end)
+    while position >= 0:
+        yield position + 1
+        position = data.find(b'\n' + prefix, position + 1, end)
+
+
+def _find_line_start(data, tag, offset, end=None):
+    """Offset of the first line at or after ``offset`` starting with ``tag``, or -1."""
+    end = len(data) if end is None else end
+    if data[offset:offset + len(tag)] == tag:
+        return offset
+    position = data.find(b'\n' + tag, offset, end)
+    return -1 if position < 0 else position + 1
+
+
+def _start_table_label(line):
+    # Compare as bytes, so lines that only look like headers are never decoded
+    label = line[5:].rstrip(b'\r\n').strip()
+    if not label or not line.endswith(b'\n'):
+        return None
+    if line.rstrip(b'\r\n') != b'Table' + label.rjust(9):
+        return None
+    try:
+        return label.decode(locale.getpreferredencoding(False))
+    except UnicodeDecodeError:
+        return None
+
+
+@contextmanager
+def _map_file(result_file):
+    # mmap cannot map an empty file
+    if os.fstat(result_file.fileno()).st_size == 0:
+        yield b''
+        return
+    with mmap.mmap(result_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        yield data
+
+
+def _read_spans(data, spans):
+    if len(spans) == 1:
+        offset, length = spans[0]
+        return data[offset:offset + length]
+    return b''.join(data[offset:offset + length] for offset, length in spans)
+
+
+# Strings read_fwf treats as missing by default
+_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+              '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+_FIELD_DELIMITERS = '\n\r\t '
+
+
+class FixedWidthLayout:
+    """Column boundaries of a fixed-width table.
+
+    A layout slices every line of a table at once by laying the lines out as
+    a character matrix, so fields are extracted per column with NumPy rather
+    than per line. Layouts come from a table's explicit widths or are
+    inferred from its sample rows on every parse, as read_fwf does.
+    """
+
+    def __init__(self, colspecs):
+        self.colspecs = [(int(start), int(end)) for start, end in colspecs]
+        self.width = max([end for _, end in self.colspecs], default=0)
+
+    def __repr__(self):
+        return f'FixedWidthLayout({self.colspecs!r})'
+
+    @classmethod
+    def from_widths(cls, widths):
+        ends = np.cumsum(widths)
+        return cls(zip(ends - widths, ends))
+
+    @classmethod
+    def infer(cls, lines):
+        # Same rule as read_fwf: a column is any run of character positions
+        # that holds something other than whitespace in at least one line
+        mask = _non_blank_mask(lines)
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], mask, [0]])))
+        return cls(zip(edges[::2], edges[1::2]))
+
+    def split(self, lines):
+        """Return a lines x columns array of stripped field strings."""
+        chars = _char_matrix(lines, self.width)
+        field_width = max([end - start for start, end in self.colspecs], default=1)
+        fields = np.zeros((len(lines), len(self.colspecs), field_width), dtype=np.uint32)
+        for i, (start, end) in enumerate(self.colspecs):
+            fields[:, i, :end - start] = chars[:, start:end]
+        fields = fields.view(f'U{field_width}').reshape(len(lines), len(self.colspecs))
+        return np.char.strip(fields, _FIELD_DELIMITERS)
+
+
+def _char_matrix(lines, width):
+    if width == 0:
+        return np.zeros((len(lines), 0), dtype=np.uint32)
+    return np.array(lines, dtype=f'U{width}').view(np.uint32).reshape(len(lines), width)
+
+
+def _non_blank_mask(lines):
+    width = max(map(len, lines), default=0)
+    chars = _char_matrix(lines, width)
+    blank = np.isin(chars, [0] + [ord(c) for c in _FIELD_DELIMITERS])
+    return (~blank).any(axis=0).astype(np.int8)
+
+
+def _table_layout(table_def, sample_lines):
+    # Inference depends on the data rows as well as the header, so a layout
+    # cannot be shared between reports that print the same header
+    if table_def.widths is not None:
+        return FixedWidthLayout.from_widths(table_def.widths)
+    return FixedWidthLayout.infer(sample_lines)
+
+
+def _read_fixed_width(text, table_def, infer_nrows=100):
+    """Read a table the way ``pd.read_fwf(..., skiprows=skip_rows)`` would.
+
+    The first non-blank line after ``skip_rows`` is the header, blank lines
+    are dropped, and each column becomes numeric where every value parses,
+    otherwise strings with read_fwf's default missing values. Returns the
+    column names and one array per column.
+    """
+    lines = text.split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    lines = lines[table_def.skip_rows:]
+
+    if not lines:
+        raise pd.errors.EmptyDataError('No rows from which to infer column width')
+
+    layout = _table_layout(table_def, lines[:infer_nrows])
+    fields = layout.split(lines)
+
+    blank = (np.char.str_len(np.char.strip(fields)) == 0).all(axis=1)
+    fields = fields[~blank]
 
-    table_def = _table_parameters[table_label]
-    start_table_tag = 'Table{:>9s}\n'.format(table_def.table_id)
+    if fields.shape[0] == 0 or fields.shape[1] == 0:
+        raise pd.errors.EmptyDataError('No columns to parse from file')
 
-    end_table_tag = table_def.end_table_tag
-    skip_rows = table_def.skip_rows
+    header, fields = fields[0], fields[1:]
+    names = _dedup_names([str(name) or f'Unnamed: {i}' for i, name in enumerate(header)])
 
-    found_table = False
-    table = StringIO('')
+    missing = np.isin(fields, _NA_VALUES)
+    objects = fields.astype(object)
+    objects[missing] = np.nan
 
-    with open(result_file_path, 'r') as result_file:
-        for line in result_file:
-            if line.startswith(start_table_tag):
-                found_table = True
+    columns = [_infer_column(objects[:, i], fields[:, i], missing[:, i]) for i in range(len(names))]
+    return names, columns
 
-            if found_table:
-                if line.startswith(end_table_tag):
-                    found_table = False
-                else:
-                    table.write(line)
 
-    table.seek(0)
+_BOOL_STRINGS = {'True': True, 'TRUE': True, 'true': True, 'False': False, 'FALSE': False, 'false': False}
 
-    df = pd.read_fwf(table, widths=table_def.widths, skiprows=skip_rows)
 
-    if table_def.df_drop_top_rows is not None:
-        df = df[table_def.df_drop_top_rows:]
+def _infer_column(column, values, missing):
+    if len(column) == 0:
+        return column
+
+    try:
+        return _to_numeric(column)
+    except (ValueError, TypeError):
+        pass
+
+    # Only all-boolean columns become bool, so checking one value rules most out
+    present = values[~missing]
+    if len(present) and present[0] in _BOOL_STRINGS and np.isin(present, list(_BOOL_STRINGS)).all():
+        if not missing.any():
+            return np.isin(values, ['True', 'TRUE', 'true'])
+        column = column.copy()
+        column[~missing] = np.isin(present, ['True', 'TRUE', 'true'])
+
+    return column
+
+
+def _to_numeric(values):
+    # Casting an object array of strings is much cheaper than pd.to_numeric,
+    # which is only needed for values neither int64 nor float64 can hold
+    try:
+        return values.astype(np.int64)
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    try:
+        floats = values.astype(np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(values)
 
-    if table_def.df_drop_tail_rows is not None:
-        df = df[:-table_def.df_drop_tail_rows]
+    # float() also accepts spellings of nan and inf that pandas does not
+    if (~np.isfinite(floats) & ~pd.isna(values)).any():
+        return pd.to_numeric(values)
+    return floats
+
+
+def _dedup_names(names):
+    seen = {}
+    deduped = []
+    for name in names:
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f'{base}.{seen[base]}'
+        seen.setdefault(base, 0)
+        seen[name] = seen.get(name, 0)
+        deduped.append(name)
+    return deduped
+
+
+def _parse_table_buffer(buffer, table_def):
+    # Decode the same way open(path, 'r') would, including newline handling
+    with _stage('decode', label=table_def.table_id):
+        text = buffer.decode(locale.getpreferredencoding(False)).replace('\r\n', '\n').replace('\r', '\n')
+
+    with _stage('split', label=table_def.table_id) as stage:
+        names, columns = _read_fixed_width(text, table_def)
+        stage.rows = len(columns[0])
+
+    # Dropped rows keep their original row labels, as with iloc
+    top = table_def.df_drop_top_rows or 0
+    tail = table_def.df_drop_tail_rows or 0
+    stop = max(len(columns[0]) - tail, top)
+    if top or tail:
+        columns = [column[top:stop] for column in columns]
 
     if table_def.reset_header:
-        columns = df.columns
-        df.columns = np.arange(len(columns))
+        names = list(range(len(names)))
 
     if table_def.rename_columns is not None:
-        df = df.rename(columns=table_def.rename_columns)
+        names = [table_def.rename_columns.get(name, name) for name in names]
 
     if table_def.int_columns is not None or table_def.convert_numerics:
-        df = df.applymap(np.vectorize(replace_dash))
+        with _stage('numerics', label=table_def.table_id):
+            columns = _convert_numerics(names, columns, table_def)
+
+    with _stage('table_frame', label=table_def.table_id) as stage:
+        df = pd.DataFrame(dict(enumerate(columns)), index=pd.RangeIndex(top, stop))
+        df.columns = names
+
+        if table_def.index_col is not None:
+            df = df.set_index(table_def.index_col)
+        stage.rows = len(df)
+
+    return df
+
+
+def _convert_numerics(names, columns, table_def):
+    """Replace '-' placeholders and convert numeric columns, column by column.
+
+    Dashes become 0 in every text column. ``int_columns`` are cast to int64
+    and, with ``convert_numerics``, every other column except the index
+    column is made numeric.
+    """
+    int_columns = table_def.int_columns
+    if isinstance(int_columns, str):
+        int_columns = [int_columns]
+    int_columns = set(int_columns or [])
+    missing = int_columns.difference(names)
+    if missing:
+        raise KeyError(f'None of {sorted(missing)} are in the columns')
+
+    converted = []
+    for name, values in zip(names, columns):
+        if values.dtype == object:
+            dashes = values == '-'
+            if dashes.any():
+                values = values.copy()
+                values[dashes] = 0
+
+        if name in int_columns:
+            if values.dtype == object:
+                values = _to_numeric(values)
+            # NumPy would cast NaN and inf to a sentinel integer, pandas raises
+            if values.dtype.kind == 'f' and not np.isfinite(values).all():
+                raise pd.errors.IntCastingNaNError('Cannot convert non-finite values (NA or inf) to integer')
+            values = values.astype(np.int64)
+        elif table_def.convert_numerics and name != table_def.index_col and values.dtype == object:
+            values = _to_numeric(values)
+
+        converted.append(values)
+    return converted
+
+
+def parse_tables(result_file_path, table_labels, table_index=None):
+    """Parse several tables from a STOPS Results file in a single pass.
+
+    ``table_index`` may be a result of ``index_tables`` for the same file, in
+    which case the file is not rescanned. Returns a dict of DataFrames keyed
+    by table label.
+    """
+    table_labels = list(table_labels)
+    table_defs = {label: _table_parameters[label] for label in table_labels}
+
+    with _stage('parse_tables', result_file_path) as stage:
+        cache = get_cache()
+        tables = {}
+        if cache is not None:
+            with _stage('table_cache_load') as load_stage:
+                for label in table_labels:
+                    df = cache.load('table', [result_file_path], vars(table_defs[label]))
+                    if df is not None:
+                        tables[label] = df
+                load_stage.rows = sum(len(df) for df in tables.values())
+
+        missing = [label for label in table_labels if label not in tables]
+        if missing:
+            if table_index is None:
+                table_index = index_tables(result_file_path)
+
+            with open(result_file_path, 'rb') as result_file, _map_file(result_file) as data:
+                for label in missing:
+                    with _stage('read', label=label) as read_stage:
+                        buffer = _read_spans(data, table_index.get(label, []))
+                        read_stage.bytes_read = len(buffer)
+                    tables[label] = _parse_table_buffer(buffer, table_defs[label])
+                    if cache is not None:
+                        cache.store('table', [result_file_path], vars(table_defs[label]), tables[label])
+
+        stage.rows = sum(len(df) for df in tables.values())
+
+    return {label: tables[label] for label in table_labels}
 
-    if table_def.int_columns is not None:
-        df[table_def.int_columns] = df[table_def.int_columns].astype(np.int64)
 
-    if table_def.index_col is not None:
-        df = df.set_index(table_def.index_col)
+def parse_table(result_file_path, table_label):
+    return parse_tables(result_file_path, [table_label])[table_label]
+
+
+def parse_reports(result_file_paths, table_labels, max_workers=None, use_processes=True):
+    """Parse the same tables from many STOPS Results files in parallel.
+
+    ``result_file_paths`` is a list of Results files or a glob pattern. Each
+    file is parsed by a worker with ``parse_tables`` and the results are
+    stacked under ``alternative``, ``exist``, ``nobuild`` and ``build``
+    index levels. The alternative is the file name without extension, e.g.
+    ``AC_m19-s19-d19#m19-s19-d19#m20-s19-d19-alt2_20_STOPSY2019Results``,
+    so runs that share a build scenario but differ in their existing or
+    no-build cores or in the STOPS year stay apart; the other three levels
+    hold the cores named in it (empty for files not named like that). A
+    single table label returns one DataFrame, a list of labels returns a
+    dict of DataFrames keyed by label.
+
+    Worker processes use the cache set with ``enable_cache`` and report
+    their stages to the active profiler, as threads do.
+    """
+    if isinstance(result_file_paths, str):
+        pattern = result_file_paths
+        result_file_paths = sorted(glob.glob(pattern))
+        if not result_file_paths:
+            raise FileNotFoundError(f'No Results files match {pattern!r}')
+    result_file_paths = list(result_file_paths)
+    if not result_file_paths:
+        raise ValueError('No Results files given')
+
+    single_table = isinstance(table_labels, str)
+    if single_table:
+        table_labels = [table_labels]
+    table_labels = list(table_labels)
+
+    keys = [_alternative_key(path) for path in result_file_paths]
+    alternatives = [key[0] for key in keys]
+    duplicates = sorted({name for name in alternatives if alternatives.count(name) > 1})
+    if duplicates:
+        raise ValueError(f'Results files from different directories share the alternative names {duplicates}')
+
+    if use_processes:
+        profiler = get_profiler()
+        trace_memory = profiler.trace_memory if profiler is not None else None
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_parse_tables_in_process, path, table_labels, get_cache(), trace_memory)
+                       for path in result_file_paths]
+            reports = []
+            for future in futures:
+                report, records = future.result()
+                reports.append(report)
+                for record in records:
+                    profiler._add(record)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(parse_tables, path, table_labels) for path in result_file_paths]
+            reports = [future.result() for future in futures]
+
+    tables = {}
+    for label in table_labels:
+        tables[label] = pd.concat([report[label] for report in reports], keys=keys,
+                                  names=['alternative', 'exist', 'nobuild', 'build'])
+
+    if single_table:
+        return tables[table_labels[0]]
+    return tables
+
+
+def _alternative_key(result_file_path):
+    alternative = os.path.splitext(os.path.basename(result_file_path))[0]
+    try:
+        return (alternative, *_scenario_names(result_file_path))
+    except ValueError:
+        # Not named AC_<exist>#<nobuild>#<build>_STOPSY<year>Results
+        return (alternative, '', '', '')
+
+
+def _parse_tables_in_process(result_file_path, table_labels, cache, trace_memory):
+    # A spawned worker starts without the parent's cache and profiler, so set them up from its settings
+    if cache is not None:
+        enable_cache(cache.directory, cache.max_bytes)
+    else:
+        disable_cache()
+    if trace_memory is None:
+        return parse_tables(result_file_path, table_labels), []
+    with profile(trace_memory) as profiler:
+        tables = parse_tables(result_file_path, table_labels)
+    return tables, profiler.records
 
-    if table_def.convert_numerics:
-        df = df.apply(pd.to_numeric)
 
-    return df.copy()
+def summarize_access_modes(result_file_path, percentage=False):
+    tbl = parse_table(result_file_path, '9.01')
+    return _summarize_access_modes(tbl, percentage)
 
 
-def summarize_access_modes(result_file_path, percentage=False):
-    table_label = '9.01'
-    tbl = parse_table(result_file_path, table_label)
-    table_def = _table_parameters[table_label]
+def _summarize_access_modes(tbl, percentage=False):
+    table_def = _table_parameters['9.01']
     
     if not percentage:
         return tbl[table_def.int_columns].sum()
@@ -0,0 +1,82 @@
+import os
+
+from .reader import _summarize_access_modes, _table_parameters, index_tables, parse_tables
+from .skim_reader import _root_skim_path, _scenario_names, _skim_directory, read_skim
+
+
+class StopsReport:
+    """A STOPS Results file with lazily parsed, memoized tables.
+
+    The file is indexed the first time a table is requested and every table
+    is parsed at most once per instance, so the Results file is assumed not
+    to change while the report is in use. Tables are available by label
+    (``report['10.01']``) or through the named properties below.
+    """
+
+    def __init__(self, result_file_path):
+        self.result_file_path = result_file_path
+        self.skim_directory = _skim_directory(result_file_path)
+        self.scenario_names = dict(zip(('exist', 'nobuild', 'build'), _scenario_names(result_file_path)))
+
+        self._table_index = None
+        self._tables = {}
+
+    def __repr__(self):
+        return f'StopsReport({self.result_file_path!r})'
+
+    def __getitem__(self, table_label):
+        return self.tables([table_label])[table_label]
+
+    def __contains__(self, table_label):
+        return table_label in self.table_index
+
+    @property
+    def table_index(self):
+        if self._table_index is None:
+            self._table_index = index_tables(self.result_file_path)
+        return self._table_index
+
+    @property
+    def labels(self):
+        """Labels of the tables found in the file that pySTOPS can parse."""
+        return [label for label in self.table_index if label in _table_parameters]
+
+    def tables(self, table_labels):
+        """Return a dict of DataFrames, parsing only labels not seen before."""
+        table_labels = list(table_labels)
+        missing = [label for label in table_labels if label not in self._tables]
+        if missing:
+            self._tables.update(parse_tables(self.result_file_path, missing, self.table_index))
+        return {label: self._tables[label] for label in table_labels}
+
+    def clear(self):
+        self._table_index = None
+        self._tables = {}
+
+    @property
+    def station_listing(self):
+        return self['1.02']
+
+    @property
+    def pmt_change(self):
+        return self['8.01']
+
+    @property
+    def station_boardings(self):
+        return self['9.01']
+
+    @property
+    def route_boardings(self):
+        return self['10.01']
+
+    def summarize_access_modes(self, percentage=False):
+        return _summarize_access_modes(self.station_boardings, percentage)
+
+    def skim_path(self, scenario='build', mode='fg', access='walk', period='pk'):
+        return f'{_root_skim_path(self.result_file_path, scenario, mode, access, period)}.bin'
+
+    def has_skim(self, scenario='build', mode='fg', access='walk', period='pk'):
+        return os.path.exists(self.skim_path(scenario, mode, access, period))
+
+    def read_skim(self, scenario='build', mode='fg', access='walk', period='pk', **kwargs):
+        return read_skim(self.result_file_path, scenario, mode, access, period, **kwargs)
@@ -1,56 +1,241 @@
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
 import pandas as pd
 
+from .cache import _file_stamp, get_cache
+from .profiling import _stage
 
-def _apply_stop_names(skim, result_file, scenario='build', mode='fg', period='pk'):
-    root_skim_path = _root_skim_path(result_file, scenario, mode, '', period)
+
+_STOP_COLUMNS = ['ISTOP_NO-01', 'JSTOP_NO-01', 'ISTOP_NO-02', 'JSTOP_NO-02',
+                 'ISTOP_NO-03', 'JSTOP_NO-03', 'ISTOP_NO-04', 'JSTOP_NO-04']
+_TRIP_COLUMNS = ['TRIP_NO-01', 'TRIP_NO-02', 'TRIP_NO-03', 'TRIP_NO-04']
+
+
+_TRIP_FIELDS = ['trip_no','comma','trip_id','comma','orig_trip_id', 'route_no', 'comma',
+                'route_id','comma','orig_route_id','comma',
+                'route_short_name','comma','route_long_name','comma','route_desc','comma',
+                'route_type','comma','route_used','comma','begin_time','comma','end_time','comma',
+                'mileage']
+
+_TRIP_WIDTHS = [10,1,10,1,25,10,1,
+                10,1,25,1,40,1,
+                40,1,40,1,2,1,
+                2,1,10,1,10,1,10]
+
+_SCENARIO_ALIASES = {
+    'exist': 'EXST',
+    'nobuild': 'NOBL',
+    'build': 'BLD-'
+}
+
+_ACCESS_ALIASES = {
+    'walk': 'WLK',
+    'knr': 'KNR',
+    'pnr': 'PNR',
+    '': ''
+}
+
+# Parsed stops.txt/trips.txt keyed by path, shared by every skim read
+_lookup_tables = {}
+
+
+def _parse_stops(stops_path):
     dtypes = {
         'stop_no': np.int16,
         'orig_stop_id': str,
         'stop_name': str
     }
 
-    stops = pd.read_csv(f'{root_skim_path}stops.txt',
-                        usecols=dtypes.keys(), dtype=dtypes
-                        )
+    stops = pd.read_csv(stops_path, usecols=dtypes.keys(), dtype=dtypes)
+    return stops.rename(columns={'orig_stop_id': 'stop_id'})
+
+
+def _parse_trips(trips_path):
+    with open(trips_path, 'rb') as f:
+        lines = f.read().splitlines()[1:]
+    lines = [line for line in lines if line.strip()]
+
+    # Slice every field out of the fixed-width records at once
+    width = sum(_TRIP_WIDTHS)
+    records = np.array(lines, dtype=f'S{width}').view(np.uint8).reshape(len(lines), width)
+    bounds = dict(zip(_TRIP_FIELDS, zip(np.cumsum([0] + _TRIP_WIDTHS[:-1]), np.cumsum(_TRIP_WIDTHS))))
+
+    def field(name):
+        start, end = bounds[name]
+        values = np.ascontiguousarray(records[:, start:end]).view(f'S{end - start}').ravel()
+        return np.char.strip(values)
+
+    def text_field(name):
+        values = pd.Series(np.char.decode(field(name), 'UTF-8'))
+        return values.where(values != '')
+
+    return pd.DataFrame({
+        'trip_no': field('trip_no').astype(np.int64),
+        'trip_id': text_field('orig_trip_id'),
+        'route_id': text_field('orig_route_id'),
+        'route_short_name': text_field('route_short_name'),
+    })
+
+
+def _lookup_table(path, parse):
+    stamp = _file_stamp(path)
+    key = (parse.__name__, os.path.abspath(path))
+
+    entry = _lookup_tables.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    cache = get_cache()
+    table = None
+    if cache is not None:
+        table = cache.load('lookup', [path], {'parser': parse.__name__})
+
+    if table is None:
+        with _stage('read_lookup', path) as stage:
+            table = parse(path)
+            stage.bytes_read = stamp[0]
+            stage.rows = len(table)
+        if cache is not None:
+            cache.store('lookup', [path], {'parser': parse.__name__}, table)
+
+    _lookup_tables[key] = (stamp, table)
+    return table
 
-    for col in ['ISTOP_NO-01', 'JSTOP_NO-01','ISTOP_NO-02','JSTOP_NO-02','ISTOP_NO-03','JSTOP_NO-03','ISTOP_NO-04','JSTOP_NO-04']:
-        skim = pd.merge(skim, stops, left_on=col, right_on='stop_no', how='left')
-        skim = skim.drop(columns=['stop_no', col])
-        skim = skim.rename(columns={'orig_stop_id': col, 'stop_name': f'{col}_name'})
-    
-    return skim
 
+def read_stops(result_file, scenario='build', mode='fg', period='pk', store=None):
+    """stop_no, stop_id and stop_name from a skim set's stops.txt.
 
-def _apply_trip_names(skim, result_file, scenario='build', mode='fg', period='pk'):
-    root_skim_path = _root_skim_path(result_file, scenario, mode, '', period)
+    Lookup files are parsed once per path and kept until the file changes.
+    With ``store`` the copy in a converted skim store is read instead.
+    """
+    return _lookup_table(f'{_lookup_root(result_file, scenario, mode, period, store)}stops.txt', _parse_stops)
+
+
+def read_trips(result_file, scenario='build', mode='fg', period='pk', store=None):
+    """trip_no, trip_id, route_id and route_short_name from a skim set's trips.txt.
+
+    Lookup files are parsed once per path and kept until the file changes.
+    With ``store`` the copy in a converted skim store is read instead.
+    """
+    return _lookup_table(f'{_lookup_root(result_file, scenario, mode, period, store)}trips.txt', _parse_trips)
+
+
+def _lookup_root(result_file, scenario='build', mode='fg', period='pk', store=None):
+    if store is None:
+        return _root_skim_path(result_file, scenario, mode, '', period)
+    return os.path.join(_store_partition(store, result_file, scenario, mode, '', period), '')
+
+
+def clear_lookups():
+    _lookup_tables.clear()
+
+
+def _apply_stop_names(skim, result_file, scenario='build', mode='fg', period='pk', as_category=False, store=None):
+    with _stage('stop_names') as stage:
+        named = _stop_name_columns(skim, result_file, scenario, mode, period, as_category, store)
+        stage.rows = len(named)
+    return named
+
+
+def _stop_name_columns(skim, result_file, scenario='build', mode='fg', period='pk', as_category=False, store=None):
+    stops = read_stops(result_file, scenario, mode, period, store)
+
+    cols = [col for col in _STOP_COLUMNS if col in skim]
+    stop_nos = [skim[col].to_numpy() for col in cols]
+    stop_ids = _take_lookup(stops['stop_no'], stops['stop_id'], stop_nos, as_category)
+    stop_names = _take_lookup(stops['stop_no'], stops['stop_name'], stop_nos, as_category)
+
+    named = {}
+    for col, stop_id, stop_name in zip(cols, stop_ids, stop_names):
+        named[col] = stop_id
+        named[f'{col}_name'] = stop_name
     
+    return _replace_columns(skim, cols, named)
+
+
+def _apply_trip_names(skim, result_file, scenario='build', mode='fg', period='pk', as_category=False, store=None):
+    with _stage('trip_names') as stage:
+        named = _trip_name_columns(skim, result_file, scenario, mode, period, as_category, store)
+        stage.rows = len(named)
+    return named
 
-    cols = ['trip_no','comma','trip_id','comma','orig_trip_id', 'route_no', 'comma',
-            'route_id','comma','orig_route_id','comma',
-            'route_short_name','comma','route_long_name','comma','route_desc','comma',
-            'route_type','comma','route_used','comma','begin_time','comma','end_time','comma',
-            'mileage']
-
-    widths = [10,1,10,1,25,10,1,
-              10,1,25,1,40,1,
-              40,1,40,1,2,1,
-              2,1,10,1,10,1,10]
-
-    trips = pd.read_fwf(f'{root_skim_path}trips.txt', widths=widths)
-    trips.columns = cols
-    trips = trips[['trip_no', 'orig_trip_id', 'orig_route_id', 'route_short_name']].copy()
-    trips[['orig_trip_id', 'orig_route_id', 'route_short_name']] = trips[['orig_trip_id', 'orig_route_id', 'route_short_name']].applymap(lambda x: x.strip())
-    trips.columns = ['trip_no', 'trip_id', 'route_id', 'route_short_name']
+
+def _trip_name_columns(skim, result_file, scenario='build', mode='fg', period='pk', as_category=False, store=None):
+    trips = read_trips(result_file, scenario, mode, period, store)
     
-    for col in ['TRIP_NO-01', 'TRIP_NO-02', 'TRIP_NO-03', 'TRIP_NO-04']:
-        skim = pd.merge(skim, trips, left_on=col, right_on='trip_no', how='left')
-        skim = skim.drop(columns=['trip_no', col])
-        skim = skim.rename(columns={'trip_id': col, 'route_id': f'{col}_route_id', 'route_short_name': f'{col}_route_name'})
+    cols = [col for col in _TRIP_COLUMNS if col in skim]
+    trip_nos = [skim[col].to_numpy() for col in cols]
+    trip_ids = _take_lookup(trips['trip_no'], trips['trip_id'], trip_nos, as_category)
+    route_ids = _take_lookup(trips['trip_no'], trips['route_id'], trip_nos, as_category)
+    route_names = _take_lookup(trips['trip_no'], trips['route_short_name'], trip_nos, as_category)
+
+    named = {}
+    for col, trip_id, route_id, route_name in zip(cols, trip_ids, route_ids, route_names):
+        named[col] = trip_id
+        named[f'{col}_route_id'] = route_id
+        named[f'{col}_route_name'] = route_name
     
-    return skim
+    return _replace_columns(skim, cols, named)
+
+
+def _take_lookup(keys, values, indices, as_category=False):
+    """Look up ``values`` by integer ``keys`` for each array in ``indices``.
+
+    The lookup is a dense array indexed by key, so each index array is
+    resolved with one ``take``. Indices with no matching key come back as
+    missing, the same as a left merge.
+    """
+    codes, categories = pd.factorize(pd.Series(values))
+    table = _key_table(keys, codes)
+
+    taken = []
+    for index in indices:
+        index_codes = _take_codes(table, index)
+        if as_category:
+            taken.append(pd.Categorical.from_codes(index_codes, categories=categories))
+        else:
+            taken.append(categories.array.take(index_codes, allow_fill=True))
+    return taken
+
+
+def _key_table(keys, codes):
+    # Dense array mapping each non-negative integer key to its code, -1 elsewhere
+    keys = np.asarray(keys, dtype=np.int64)
+    valid_keys = keys >= 0
+    table = np.full(keys[valid_keys].max() + 1 if valid_keys.any() else 0, -1, dtype=np.int64)
+    table[keys[valid_keys]] = np.asarray(codes)[valid_keys]
+    return table
+
+
+def _take_codes(table, index):
+    index = np.asarray(index, dtype=np.int64)
+    valid = (index >= 0) & (index < len(table))
+    codes = np.full(len(index), -1, dtype=np.int64)
+    codes[valid] = table[index[valid]]
+    return codes
+
+
+def _replace_columns(skim, dropped, added):
+    # Matches the column order the merges used to produce: dropped columns
+    # go away and their replacements are appended at the end
+    skim = skim.drop(columns=dropped)
+    added = pd.DataFrame(added, index=skim.index)
+    return pd.concat([skim, added], axis=1)
+
+
+def _skim_directory(result_file):
+    path = os.path.split(result_file)[0]
+    return os.path.join(os.path.split(path)[0], 'Skims')
+
+
+def _scenario_names(result_file):
+    # Break up the filename to get the respective scenario names
+    file_name = os.path.split(result_file)[1]
+    exst, nobld, bld = file_name[3:file_name.find('STOPSY')-1].split('#')
+    return exst, nobld, bld
 
 
 def _root_skim_path(result_file, scenario='build', mode='fg', access='walk', period='pk'):
@@ -59,25 +244,9 @@ def _root_skim_path(result_file, scenario='build', mode='fg', access='walk', per
     assert access in ('walk', 'pnr', 'knr', '')
     assert period in ('op', 'pk', '')
     
-    scenario_aliases = {
-        'exist': 'EXST',
-        'nobuild': 'NOBL',
-        'build': 'BLD-'
-    }
-    
-    access_aliases = {
-        'walk': 'WLK',
-        'knr': 'KNR',
-        'pnr': 'PNR',
-        '': ''
-    }
-    
     # Build out the skim path
-    path, file_name = os.path.split(result_file)
-    skim_path = os.path.join(os.path.split(path)[0], 'Skims')
-    
-    # Break up the filename to get the respective scenario names
-    exst, nobld, bld = file_name[3:file_name.find('STOPSY')-1].split('#')
+    skim_path = _skim_directory(result_file)
+    exst, nobld, bld = _scenario_names(result_file)
     core_name = exst
 
     if scenario == 'build':
@@ -86,20 +255,299 @@ def _root_skim_path(result_file, scenario='build', mode='fg', access='walk', per
     if scenario == 'nobuild':
         core_name = nobld
     
-    return os.path.join(skim_path, f'AC_{core_name}_STOPS_Path_{period.upper()}_{mode.upper()}_{scenario_aliases[scenario]}{access_aliases[access]}skim')
+    return os.path.join(skim_path, f'AC_{core_name}_STOPS_Path_{period.upper()}_{mode.upper()}_{_SCENARIO_ALIASES[scenario]}{_ACCESS_ALIASES[access]}skim')
 
 
-def read_skim(result_file, scenario='build', mode='fg', access='walk', period='pk', apply_stop_name=False):
+def _skim_path(result_file, scenario='build', mode='fg', access='walk', period='pk', store=None):
+    if store is None:
+        return f'{_root_skim_path(result_file, scenario, mode, access, period)}.bin'
+    return os.path.join(_store_partition(store, result_file, scenario, mode, access, period), 'skim.bin')
+
+
+def _skim_exists(result_file, scenario='build', mode='fg', access='walk', period='pk', store=None):
+    skim_path = _skim_path(result_file, scenario, mode, access, period, store)
+    # A store partition holds the skim's columns and .dcb but no .bin
+    return os.path.exists(skim_path if store is None else f'{skim_path[:-4]}.dcb')
+
+
+def read_skim(result_file, scenario='build', mode='fg', access='walk', period='pk', apply_stop_name=False,
+              columns=None, memory_map=None, strings='object', origins=None, compact=False, store=None):
+    with _stage('read_skim', f'{_root_skim_path(result_file, scenario, mode, access, period)}.bin') as stage:
+        skim = _read_skim(result_file, scenario, mode, access, period, apply_stop_name, columns, memory_map,
+                          strings, origins, compact, store)
+        stage.rows = len(skim)
+    return skim
+
+
+def _read_skim(result_file, scenario='build', mode='fg', access='walk', period='pk', apply_stop_name=False,
+               columns=None, memory_map=None, strings='object', origins=None, compact=False, store=None):
     root_skim_path = _root_skim_path(result_file, scenario, mode, access, period)
-    
-    skim_path = f'{root_skim_path}.bin'
-    skim = binary_as_pandas(skim_path)
+    skim_path = _skim_path(result_file, scenario, mode, access, period, store)
+
+    if compact:
+        skim = _read_skim(result_file, scenario, mode, access, period, columns=columns, memory_map=memory_map,
+                          strings='codes', origins=origins, store=store)
+        with _stage('compact'):
+            return _compact_skim(skim, skim_path, skim_dictionary(result_file), result_file, scenario, mode,
+                                 period, apply_stop_name, store)
+
+    if origins is not None:
+        origins = sorted({str(origin) for origin in ([origins] if isinstance(origins, str) else origins)})
+
+    if store is not None:
+        # Stores are already column-per-file, so they bypass the disk cache
+        skim = store_as_pandas(os.path.dirname(skim_path), columns, strings, origins)
+        if apply_stop_name:
+            as_category = strings != 'object'
+            skim = _apply_stop_names(skim, result_file, scenario, mode, period, as_category, store)
+            skim = _apply_trip_names(skim, result_file, scenario, mode, period, as_category, store)
+        return skim
+
+    cache = get_cache()
+    if cache is not None:
+        source_paths = [skim_path, f'{root_skim_path}.dcb']
+        if apply_stop_name:
+            lookup_path = _root_skim_path(result_file, scenario, mode, '', period)
+            source_paths += [f'{lookup_path}stops.txt', f'{lookup_path}trips.txt']
+        params = {'apply_stop_name': apply_stop_name, 'columns': columns, 'strings': strings}
+        if origins is not None:
+            params['origins'] = origins
+        with _stage('skim_cache_load') as stage:
+            skim = cache.load('skim', source_paths, params)
+            stage.rows = None if skim is None else len(skim)
+        if skim is not None:
+            return skim
+
+    if origins is None:
+        skim = binary_as_pandas(skim_path, columns, memory_map, strings)
+    else:
+        skim = _read_origins(skim_path, origins, columns, strings)
     if apply_stop_name:
-        skim = _apply_stop_names(skim, result_file, scenario, mode, period)
-        skim = _apply_trip_names(skim, result_file, scenario, mode, period)
+        as_category = strings != 'object'
+        skim = _apply_stop_names(skim, result_file, scenario, mode, period, as_category)
+        skim = _apply_trip_names(skim, result_file, scenario, mode, period, as_category)
+
+    if cache is not None:
+        cache.store('skim', source_paths, params, skim)
     return skim
 
 
+class SkimDictionary:
+    """Integer codes shared by every compact skim of one STOPS run.
+
+    Each vocabulary is a DataFrame whose row positions are the codes and
+    whose first column is the key: ``taz`` for the character fields
+    (ITAZ, JTAZ), ``stops`` by stop_id, ``trips`` by trip_id and ``routes``
+    by route_id. Vocabularies only ever grow, so codes handed out earlier
+    stay valid as more skims are read.
+    """
+
+    def __init__(self):
+        self.taz = pd.DataFrame({'taz': pd.Series(dtype=object)})
+        self.stops = pd.DataFrame({'stop_id': pd.Series(dtype=object), 'stop_name': pd.Series(dtype=object)})
+        self.trips = pd.DataFrame({'trip_id': pd.Series(dtype=object)})
+        self.routes = pd.DataFrame({'route_id': pd.Series(dtype=object),
+                                    'route_short_name': pd.Series(dtype=object)})
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        sizes = ', '.join(f'{name}={len(getattr(self, name))}' for name in ('taz', 'stops', 'trips', 'routes'))
+        return f'SkimDictionary({sizes})'
+
+    def encode(self, vocabulary, table):
+        """Codes of the rows of ``table`` in ``vocabulary``, adding unseen keys.
+
+        ``table`` has the vocabulary's columns. Rows with a missing key get -1.
+        """
+        with self._lock:
+            known = getattr(self, vocabulary)
+            key = known.columns[0]
+            keys = table[key].astype(object)
+            codes = pd.Index(known[key]).get_indexer(keys)
+
+            unseen = (codes < 0) & keys.notna().to_numpy()
+            if unseen.any():
+                added = table.loc[unseen, known.columns].drop_duplicates(key)
+                known = pd.concat([known, added.astype(object)], ignore_index=True)
+                setattr(self, vocabulary, known)
+                codes = pd.Index(known[key]).get_indexer(keys)
+        return codes
+
+    def decode(self, vocabulary, codes, column=None):
+        """Values of ``column`` (the key by default) for ``codes``, NaN for -1."""
+        known = getattr(self, vocabulary)
+        values = known[column or known.columns[0]].array
+        return values.take(np.asarray(codes, dtype=np.int64), allow_fill=True)
+
+
+# One SkimDictionary per STOPS run, keyed by skim directory
+_skim_dictionaries = {}
+_skim_dictionaries_lock = threading.Lock()
+
+
+def skim_dictionary(result_file):
+    """The ``SkimDictionary`` shared by compact skims of ``result_file``'s run."""
+    key = os.path.abspath(_skim_directory(result_file))
+    with _skim_dictionaries_lock:
+        return _skim_dictionaries.setdefault(key, SkimDictionary())
+
+
+def _compact_skim(skim, skim_path, dictionary, result_file, scenario='build', mode='fg', period='pk',
+                  apply_stop_name=False, store=None):
+    """Re-code a skim read with ``strings='codes'`` into ``dictionary`` and downcast its numbers.
+
+    With ``apply_stop_name`` stop legs become stop codes and trip legs trip
+    codes, each trip leg followed by a ``_route`` column of route codes;
+    names are looked up through the dictionary.
+    """
+    _, str_cols = retrieve_binary_structure(skim_path)
+    str_cols = [col for col in skim if col in str_cols]
+
+    taz_codes = None
+    if str_cols:
+        taz_codes = dictionary.encode('taz', pd.DataFrame({'taz': skim.attrs['dictionary']}))
+
+    stop_table = trip_table = route_table = None
+    if apply_stop_name:
+        stops = read_stops(result_file, scenario, mode, period, store)
+        stop_table = _key_table(stops['stop_no'], dictionary.encode('stops', stops))
+        trips = read_trips(result_file, scenario, mode, period, store)
+        trip_table = _key_table(trips['trip_no'], dictionary.encode('trips', trips))
+        route_table = _key_table(trips['trip_no'], dictionary.encode('routes', trips))
+
+    data = {}
+    routes = {}
+    for col in skim:
+        values = skim[col].to_numpy()
+        if col in str_cols:
+            data[col] = taz_codes[values].astype(_code_dtype(len(dictionary.taz)))
+        elif stop_table is not None and col in _STOP_COLUMNS:
+            data[col] = _take_codes(stop_table, values).astype(_code_dtype(len(dictionary.stops)))
+        elif trip_table is not None and col in _TRIP_COLUMNS:
+            data[col] = _take_codes(trip_table, values).astype(_code_dtype(len(dictionary.trips)))
+            routes[f'{col}_route'] = _take_codes(route_table, values).astype(_code_dtype(len(dictionary.routes)))
+        else:
+            data[col] = _downcast(values)
+    data.update(routes)
+    return pd.DataFrame(data, copy=False)
+
+
+def _downcast(values):
+    """``values`` in the narrowest dtype of the same kind that holds them exactly."""
+    if values.dtype.kind in 'iu' and len(values):
+        low, high = values.min(), values.max()
+        for dtype in (np.int8, np.int16, np.int32, np.int64):
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                return values.astype(dtype, copy=False)
+    if values.dtype == np.float64:
+        narrow = values.astype(np.float32)
+        if np.array_equal(narrow, values, equal_nan=True):
+            return narrow
+    return values
+
+
+def _partition_path(store, core, scenario, mode, access, period):
+    """Directory of one skim in a store, partitioned Hive style by its keys.
+
+    Lookup files (stops.txt, trips.txt) have no access key.
+    """
+    keys = [('core', core), ('scenario', scenario), ('mode', mode), ('access', access), ('period', period)]
+    return os.path.join(store, *[f'{name}={value}' for name, value in keys if value])
+
+
+def _store_partition(store, result_file, scenario='build', mode='fg', access='walk', period='pk'):
+    core = dict(zip(('exist', 'nobuild', 'build'), _scenario_names(result_file)))[scenario]
+    return _partition_path(store, core, scenario, mode, access, period)
+
+
+def store_as_pandas(partition, columns=None, strings='object', origins=None):
+    """Read one converted skim from a store partition into a DataFrame.
+
+    Each field is its own ``.npy`` file (or member of ``columns.npz`` when
+    the store is compressed), so only the requested ``columns`` are read.
+    With ``origins`` the ITAZ column is scanned first and only the matching
+    rows of the other columns are taken from memory-mapped files.
+    """
+    file_struct, str_cols = retrieve_binary_structure(os.path.join(partition, 'skim.bin'))
+    columns = list(file_struct.names) if columns is None else list(columns)
+
+    npz_path = os.path.join(partition, 'columns.npz')
+    with _stage('read_store', partition) as stage:
+        if os.path.exists(npz_path):
+            with np.load(npz_path, allow_pickle=False) as npz:
+                data = _select_rows(npz, columns, origins)
+        else:
+            needed = set(columns) | ({'ITAZ'} if origins is not None else set())
+            data = _select_rows({col: np.load(os.path.join(partition, f'{col}.npy'), mmap_mode='r',
+                                              allow_pickle=False) for col in needed}, columns, origins)
+        stage.bytes_read = sum(values.nbytes for values in data.values())
+        stage.rows = len(data[columns[0]]) if columns else 0
+    return _records_as_pandas(data, str_cols, columns, strings)
+
+
+def _select_rows(fields, columns, origins=None):
+    if origins is None:
+        return {col: np.array(fields[col]) for col in columns}
+
+    itaz = np.char.strip(fields['ITAZ'])
+    rows = np.flatnonzero(np.isin(itaz, [origin.encode() for origin in origins]))
+    return {col: np.asarray(fields[col][rows]) for col in columns}
+
+
+def read_all_skims(result_file, scenarios=('exist', 'nobuild', 'build'), modes=('bs', 'fg', 'tr'),
+                   accesses=('walk', 'pnr', 'knr'), periods=('pk', 'op'), long_format=False,
+                   max_workers=None, use_processes=False, **kwargs):
+    """Read every requested scenario/mode/access/period skim concurrently.
+
+    Combinations whose .bin file does not exist are skipped. Extra keyword
+    arguments are passed on to ``read_skim``. Returns a dict keyed by
+    ``(scenario, mode, access, period)``, or with ``long_format`` a single
+    DataFrame with those four leading columns. Threads are used unless
+    ``use_processes`` is set.
+
+    With ``compact`` and ``use_processes`` the workers only read the skims
+    with ``strings='codes'``; they are re-coded in this process, so every
+    skim shares this process's ``skim_dictionary``.
+    """
+    store = kwargs.get('store')
+    keys = [(scenario, mode, access, period)
+            for scenario in scenarios for mode in modes for access in accesses for period in periods
+            if _skim_exists(result_file, scenario, mode, access, period, store)]
+
+    compact_here = use_processes and kwargs.get('compact', False)
+    read_kwargs = kwargs
+    if compact_here:
+        read_kwargs = dict(kwargs, compact=False, apply_stop_name=False, strings='codes')
+
+    pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool(max_workers=max_workers) as executor:
+        futures = [executor.submit(read_skim, result_file, *key, **read_kwargs) for key in keys]
+        skims = {key: future.result() for key, future in zip(keys, futures)}
+
+    if compact_here:
+        dictionary = skim_dictionary(result_file)
+        for (scenario, mode, access, period), skim in skims.items():
+            skims[scenario, mode, access, period] = _compact_skim(
+                skim, _skim_path(result_file, scenario, mode, access, period, store), dictionary, result_file,
+                scenario, mode, period, kwargs.get('apply_stop_name', False), store)
+
+    if not long_format:
+        return skims
+
+    if not skims:
+        return pd.DataFrame(columns=['scenario', 'mode', 'access', 'period'])
+
+    frames = []
+    for (scenario, mode, access, period), skim in skims.items():
+        frames.append(skim.assign(scenario=scenario, mode=mode, access=access, period=period))
+    long_skims = pd.concat(frames, ignore_index=True)
+
+    key_columns = ['scenario', 'mode', 'access', 'period']
+    for col in key_columns:
+        long_skims[col] = long_skims[col].astype('category')
+    return long_skims[key_columns + [col for col in long_skims if col not in key_columns]]
+
+
 def retrieve_binary_structure(bin_file_path):
     col_names = []
     str_cols = []
@@ -128,11 +576,279 @@ def retrieve_binary_structure(bin_file_path):
     return np.dtype(list(zip(col_names, pfmt))), str_cols
 
 
-def binary_as_pandas(bin_file_path):
+def _open_binary(bin_file_path, file_struct, memory_map=False):
+    if not memory_map:
+        with _stage('read_binary', bin_file_path) as stage:
+            arr = np.fromfile(bin_file_path, file_struct)
+            stage.bytes_read = arr.nbytes
+            stage.rows = len(arr)
+        return arr
+
+    # np.memmap refuses to map an empty file
+    if os.path.getsize(bin_file_path) == 0:
+        return np.empty(0, dtype=file_struct)
+    return np.memmap(bin_file_path, dtype=file_struct, mode='r')
+
+
+def binary_as_pandas(bin_file_path, columns=None, memory_map=None, strings='object'):
+    """Read a STOPS skim .bin file into a DataFrame.
+
+    ``columns`` limits the result to the named fields. With ``memory_map``
+    (the default when ``columns`` is given) the file is mapped rather than
+    read, so only the pages backing the requested fields are touched and
+    each column is copied out on its own. ``strings`` controls how
+    character fields come back, see ``_decode_strings``.
+    """
     file_struct, str_cols = retrieve_binary_structure(bin_file_path)
-    arr = np.fromfile(bin_file_path, file_struct)
-    
-    df = pd.DataFrame(arr)
-    df[str_cols] = df[str_cols].applymap(lambda x: x.decode('UTF-8').strip()) 
-    
+    if memory_map is None:
+        memory_map = columns is not None
+
+    arr = _open_binary(bin_file_path, file_struct, memory_map)
+    return _records_as_pandas(arr, str_cols, columns, strings)
+
+
+def _records_as_pandas(arr, str_cols, columns=None, strings='object'):
+    if columns is None:
+        columns = arr.dtype.names
+    str_cols = [col for col in columns if col in str_cols]
+
+    data = {col: arr[col] for col in columns}
+    with _stage('decode_strings') as stage:
+        decoded, dictionary = _decode_strings([arr[col] for col in str_cols], strings)
+        stage.rows = len(arr)
+    data.update(zip(str_cols, decoded))
+
+    # Fields of a memory-mapped skim are only read from disk here
+    with _stage('skim_frame') as stage:
+        df = pd.DataFrame(data, columns=list(columns))
+        if isinstance(arr, np.memmap):
+            stage.bytes_read = sum(arr.dtype[col].itemsize for col in columns) * len(arr)
+        stage.rows = len(df)
+    if strings == 'codes' and str_cols:
+        df.attrs['dictionary'] = dictionary
     return df
+
+
+def _decode_strings(fields, strings='object'):
+    """Decode fixed-width byte fields through one shared dictionary.
+
+    Every distinct value across all ``fields`` is decoded and stripped once,
+    then mapped back to the rows by index. ``strings`` selects what comes
+    back for each field: 'object' for plain strings, 'category' for
+    Categoricals sharing the same categories, or 'codes' for integer codes
+    into the returned dictionary.
+    """
+    if strings not in ('object', 'category', 'codes'):
+        raise ValueError(f"strings must be 'object', 'category' or 'codes', not {strings!r}")
+
+    if not fields:
+        return [], pd.Index([], dtype=object)
+
+    width = max(field.dtype.itemsize for field in fields)
+    stacked = np.concatenate([np.asarray(field, dtype=f'S{width}') for field in fields])
+    raw_values, raw_codes = _factorize_bytes(stacked)
+
+    # Padding differences can make distinct raw values decode to the same string
+    values = np.array([value.decode('UTF-8').strip() for value in raw_values], dtype=object)
+    values, remap = np.unique(values, return_inverse=True)
+    codes = remap.astype(_code_dtype(len(values)))[raw_codes]
+
+    dictionary = pd.Index(values, dtype=object)
+    splits = np.cumsum([len(field) for field in fields])[:-1]
+    decoded = []
+    for field_codes in np.split(codes, splits):
+        if strings == 'object':
+            decoded.append(values[field_codes])
+        elif strings == 'category':
+            decoded.append(pd.Categorical.from_codes(field_codes, categories=dictionary))
+        else:
+            decoded.append(field_codes)
+    return decoded, dictionary
+
+
+def _factorize_bytes(values):
+    # Hash fixed-width byte strings as 8 byte words rather than sorting them
+    n = len(values)
+    width = values.dtype.itemsize
+    words = -(-width // 8)
+    padded = np.zeros((n, words * 8), dtype=np.uint8)
+    padded[:, :width] = values.view(np.uint8).reshape(n, width)
+    keys = padded.view(np.uint64)
+
+    codes = np.zeros(n, dtype=np.int64)
+    for word in range(words):
+        word_codes, word_values = pd.factorize(keys[:, word])
+        codes, _ = pd.factorize(codes * len(word_values) + word_codes)
+
+    first = np.empty(codes.max() + 1 if n else 0, dtype=np.int64)
+    first[codes[::-1]] = np.arange(n)[::-1]
+    return values[first], codes
+
+
+def _code_dtype(n):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class SkimIndex:
+    """Record ranges of each origin TAZ in a skim .bin file.
+
+    STOPS writes the records of an origin together, so each ``ITAZ`` maps
+    to a few runs of consecutive records. Runs are stored CSR style:
+    ``indptr[k]:indptr[k + 1]`` are the runs of ``origins[k]``, each given
+    by ``run_starts`` and ``run_lengths``. ``stamp`` is the size and
+    modification time of the .bin file the index was built from.
+    """
+
+    def __init__(self, origins, indptr, run_starts, run_lengths, stamp):
+        self.origins = origins
+        self.indptr = indptr
+        self.run_starts = run_starts
+        self.run_lengths = run_lengths
+        self.stamp = tuple(int(value) for value in stamp)
+
+    def __repr__(self):
+        return f'SkimIndex({len(self.origins)} origins, {len(self.run_starts)} runs)'
+
+    @classmethod
+    def build(cls, bin_file_path):
+        stamp = _file_stamp(bin_file_path)
+        file_struct, _ = retrieve_binary_structure(bin_file_path)
+        itaz = np.char.strip(_open_binary(bin_file_path, file_struct, memory_map=True)['ITAZ'])
+        if len(itaz) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return cls(np.zeros(0, dtype=str), np.zeros(1, dtype=np.int64), empty, empty, stamp)
+
+        run_starts = np.flatnonzero(np.concatenate([[True], itaz[1:] != itaz[:-1]]))
+        run_lengths = np.diff(np.append(run_starts, len(itaz)))
+        origins, run_origins = np.unique(itaz[run_starts], return_inverse=True)
+
+        order = np.argsort(run_origins, kind='stable')
+        indptr = np.zeros(len(origins) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(run_origins, minlength=len(origins)), out=indptr[1:])
+        return cls(origins.astype(str), indptr, run_starts[order], run_lengths[order], stamp)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            return cls(npz['origins'], npz['indptr'], npz['run_starts'], npz['run_lengths'], npz['stamp'])
+
+    def save(self, path):
+        # Write to a temporary file first so readers never see a partial index
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, origins=self.origins, indptr=self.indptr, run_starts=self.run_starts,
+                 run_lengths=self.run_lengths, stamp=np.array(self.stamp, dtype=np.int64))
+        os.replace(tmp_path, path)
+
+    def runs(self, origins):
+        """``(starts, lengths)`` of the runs of ``origins``, in file order."""
+        wanted = np.unique(np.asarray(list(origins), dtype=str))
+        positions = np.searchsorted(self.origins, wanted)
+        found = positions < len(self.origins)
+        found[found] = self.origins[positions[found]] == wanted[found]
+        positions = positions[found]
+
+        # Concatenate the run ranges indptr[k]:indptr[k + 1] of every origin
+        first = self.indptr[positions]
+        counts = self.indptr[positions + 1] - first
+        offsets = np.cumsum(counts) - counts
+        selected = np.repeat(first - offsets, counts) + np.arange(counts.sum())
+        order = np.argsort(self.run_starts[selected])
+        return self.run_starts[selected][order], self.run_lengths[selected][order]
+
+
+def _skim_index_path(bin_file_path):
+    return f'{bin_file_path[:-4]}.idx.npz'
+
+
+def skim_index(bin_file_path, rebuild=False):
+    """Load the sidecar ``.idx.npz`` index of a skim, building it if needed.
+
+    The index is rebuilt whenever the .bin file has changed since it was
+    written. If it cannot be saved next to the .bin file (e.g. a read-only
+    share) it is still returned, just not kept.
+    """
+    index_path = _skim_index_path(bin_file_path)
+    if not rebuild and os.path.exists(index_path):
+        try:
+            index = SkimIndex.load(index_path)
+        except (OSError, ValueError, KeyError):
+            index = None
+        if index is not None and index.stamp == _file_stamp(bin_file_path):
+            return index
+
+    index = SkimIndex.build(bin_file_path)
+    try:
+        index.save(index_path)
+    except OSError:
+        pass
+    return index
+
+
+def _read_origins(bin_file_path, origins, columns=None, strings='object'):
+    file_struct, str_cols = retrieve_binary_structure(bin_file_path)
+    with _stage('skim_index', bin_file_path):
+        starts, lengths = skim_index(bin_file_path).runs(origins)
+
+    arr = _open_binary(bin_file_path, file_struct, memory_map=True)
+    with _stage('read_origins', bin_file_path) as stage:
+        records = np.concatenate([arr[start:start + length] for start, length in zip(starts, lengths)]) \
+            if len(starts) else np.empty(0, dtype=file_struct)
+        stage.bytes_read = records.nbytes
+        stage.rows = len(records)
+    return _records_as_pandas(np.asarray(records), str_cols, columns, strings)
+
+
+def _where_mask(arr, where, str_cols):
+    if callable(where):
+        return np.asarray(where(arr), dtype=bool)
+
+    mask = np.ones(len(arr), dtype=bool)
+    for col, condition in where.items():
+        values = arr[col]
+        if col in str_cols:
+            values = np.char.strip(values)
+
+        if callable(condition):
+            mask &= np.asarray(condition(values), dtype=bool)
+            continue
+
+        if isinstance(condition, (str, bytes)) or np.ndim(condition) == 0:
+            condition = [condition]
+        if col in str_cols:
+            condition = [c.encode() if isinstance(c, str) else c for c in condition]
+        mask &= np.isin(values, np.asarray(condition))
+    return mask
+
+
+def iter_skim(result_file, scenario='build', mode='fg', access='walk', period='pk',
+              chunk_rows=1_000_000, where=None, columns=None, as_frame=True, strings='object'):
+    """Stream a skim in chunks of at most ``chunk_rows`` records.
+
+    ``where`` filters each chunk before it is converted. It is either a
+    callable taking the raw record array and returning a boolean mask, or a
+    dict mapping field names to a value, a list of accepted values or a
+    callable on that field, e.g. ``{'ITAZ': origins, 'PROJECTFLG': 1}``.
+    Character fields are compared without their padding. Chunks are
+    DataFrames, or the raw structured arrays when ``as_frame`` is False.
+    With ``strings`` set to 'category' or 'codes' each chunk gets its own
+    dictionary.
+    """
+    bin_file_path = f'{_root_skim_path(result_file, scenario, mode, access, period)}.bin'
+    file_struct, str_cols = retrieve_binary_structure(bin_file_path)
+
+    with open(bin_file_path, 'rb') as f:
+        while True:
+            arr = np.fromfile(f, file_struct, count=chunk_rows)
+            if len(arr) == 0:
+                break
+
+            if where is not None:
+                arr = arr[_where_mask(arr, where, str_cols)]
+
+            if not as_frame:
+                yield arr if columns is None else arr[list(columns)]
+            else:
+                yield _records_as_pandas(arr, str_cols, columns, strings)
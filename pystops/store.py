@@ -0,0 +1,128 @@
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+from .cache import _file_stamp
+from .skim_reader import _ACCESS_ALIASES, _SCENARIO_ALIASES, _open_binary, _partition_path, retrieve_binary_structure
+
+_SKIM_FILE = re.compile(r'^AC_(?P<core>.+)_STOPS_Path_(?P<period>[A-Z]+)_(?P<mode>[A-Z]+)_'
+                        r'(?P<scenario>EXST|NOBL|BLD-)(?P<access>[A-Z]*)skim(?P<suffix>\.bin|stops\.txt)$')
+
+_SCENARIOS = {alias: scenario for scenario, alias in _SCENARIO_ALIASES.items()}
+_ACCESSES = {alias: access for access, alias in _ACCESS_ALIASES.items()}
+
+MANIFEST = 'manifest.json'
+
+
+def find_skims(skim_directory):
+    """Skims and lookup file sets in a STOPS Skims directory.
+
+    Returns a list of ``(keys, source_paths)`` where ``keys`` holds core,
+    scenario, mode, access and period (access is '' for a stops.txt and
+    trips.txt pair).
+    """
+    found = []
+    for name in sorted(os.listdir(skim_directory)):
+        match = _SKIM_FILE.match(name)
+        if match is None or match['scenario'] not in _SCENARIOS or match['access'] not in _ACCESSES:
+            continue
+
+        keys = {'core': match['core'], 'scenario': _SCENARIOS[match['scenario']], 'mode': match['mode'].lower(),
+                'access': _ACCESSES[match['access']], 'period': match['period'].lower()}
+        root = os.path.join(skim_directory, name[:-len(match['suffix'])])
+        if match['suffix'] == '.bin':
+            sources = [f'{root}.bin', f'{root}.dcb']
+        else:
+            sources = [f'{root}stops.txt', f'{root}trips.txt']
+        if all(os.path.exists(path) for path in sources):
+            found.append((keys, sources))
+    return found
+
+
+def convert_skims(skim_directory, store, compress=False, force=False):
+    """Convert a STOPS Skims directory into a column-per-file store.
+
+    Every skim becomes a partition directory under ``store`` laid out as
+    ``core=/scenario=/mode=/access=/period=`` holding one ``.npy`` file per
+    field, or a single compressed ``columns.npz`` with ``compress``, plus a
+    copy of its .dcb. stops.txt and trips.txt are copied into the matching
+    partition without an access key. ``manifest.json`` records the size and
+    modification time of every source, so unchanged skims are skipped on
+    the next run unless ``force`` is set. Partitions converted from
+    ``skim_directory`` whose sources have since been deleted are removed.
+    Read the store back with ``read_skim(..., store=store)``.
+
+    Returns the partitions written, relative to ``store``.
+    """
+    os.makedirs(store, exist_ok=True)
+    manifest = load_manifest(store)
+    directory = os.path.abspath(skim_directory)
+
+    written = []
+    found = set()
+    for keys, sources in find_skims(skim_directory):
+        partition = os.path.relpath(_partition_path(store, **keys), store)
+        found.add(partition)
+        entry = {'directory': directory, 'compress': compress,
+                 'sources': [[os.path.basename(path), *_file_stamp(path)] for path in sources]}
+        if not force and manifest.get(partition) == entry and os.path.isdir(os.path.join(store, partition)):
+            continue
+
+        _write_partition(os.path.join(store, partition), sources, compress)
+        manifest[partition] = entry
+        _save_manifest(store, manifest)
+        written.append(partition)
+
+    # Partitions converted from other Skims directories are left alone
+    for partition in [name for name, entry in manifest.items()
+                      if entry.get('directory') == directory and name not in found]:
+        shutil.rmtree(os.path.join(store, partition), ignore_errors=True)
+        del manifest[partition]
+        _save_manifest(store, manifest)
+    return written
+
+
+def load_manifest(store):
+    path = os.path.join(store, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _save_manifest(store, manifest):
+    path = os.path.join(store, MANIFEST)
+    with open(f'{path}.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(f'{path}.tmp', path)
+
+
+def _write_partition(partition, sources, compress=False):
+    # Build the partition next to its final place and swap it in, so readers
+    # never see a half-written skim
+    tmp_partition = f'{partition}.tmp'
+    shutil.rmtree(tmp_partition, ignore_errors=True)
+    os.makedirs(tmp_partition)
+
+    if sources[0].endswith('.bin'):
+        bin_path, dcb_path = sources
+        file_struct, _ = retrieve_binary_structure(bin_path)
+        arr = _open_binary(bin_path, file_struct, memory_map=True)
+
+        if compress:
+            columns = {col: np.ascontiguousarray(arr[col]) for col in file_struct.names}
+            np.savez_compressed(os.path.join(tmp_partition, 'columns.npz'), **columns)
+        else:
+            # One column in memory at a time, however large the skim
+            for col in file_struct.names:
+                np.save(os.path.join(tmp_partition, f'{col}.npy'), np.ascontiguousarray(arr[col]))
+        shutil.copyfile(dcb_path, os.path.join(tmp_partition, 'skim.dcb'))
+    else:
+        for path, name in zip(sources, ('stops.txt', 'trips.txt')):
+            shutil.copyfile(path, os.path.join(tmp_partition, name))
+
+    shutil.rmtree(partition, ignore_errors=True)
+    os.replace(tmp_partition, partition)
@@ -0,0 +1,182 @@
+import os
+
+import numpy as np
+
+from .skim_reader import _TRIP_FIELDS, _TRIP_WIDTHS, _root_skim_path, retrieve_binary_structure
+
+# Skim record layout of the .dcb files STOPS writes: name, type and size in bytes
+SKIM_FIELDS = ([('MODE', 'I', 2), ('ITAZ', 'C', 12), ('JTAZ', 'C', 12)]
+               + [(name, 'F', 4) for name in ('ACC_TIME', 'XFW_TIME', 'EGR_TIME', 'WT1_TIME', 'WTX_TIME',
+                                              'FG__TIME', 'BUS_TIME', 'N__BOARD')]
+               + [(f'{end}STOP_NO-0{leg}', 'I', 4) for leg in range(1, 5) for end in 'IJ']
+               + [(f'MODE-0{leg}', 'I', 2) for leg in range(1, 5)]
+               + [(f'TRIP_NO-0{leg}', 'I', 4) for leg in range(1, 5)]
+               + [('PROJECTFLG', 'I', 2)])
+
+_DISTRICT_SCENARIOS = 3
+_DISTRICT_PURPOSES = 4
+_DISTRICT_AUTO_OWNERSHIP = 4
+
+
+def write_dcb(dcb_path):
+    """Write the .dcb layout of ``SKIM_FIELDS``, as shipped with STOPS skims."""
+    lines = ['  ', str(sum(size for _, _, size in SKIM_FIELDS))]
+    start = 1
+    for name, kind, size in SKIM_FIELDS:
+        width, decimals = {'I': (2 if name.startswith('MODE-') else 10, 0), 'F': (8, 2), 'C': (10, 0)}[kind]
+        lines.append(f'"{name}",{kind},{start},{size},0,{width},{decimals},,"","",,"Blank",')
+        start += size
+    with open(dcb_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def taz_labels(n_taz):
+    return [f'{9001 + i // 10000:05d}${i % 10000:04d}' for i in range(n_taz)]
+
+
+def write_skim(bin_path, n_records, n_taz=3000, n_stops=500, n_trips=2000, seed=0, chunk_rows=1_000_000):
+    """Write a synthetic skim .bin and its .dcb.
+
+    Records are grouped by origin like STOPS output, with random
+    destinations, times, up to four legs over ``n_stops`` stops and
+    ``n_trips`` trips (stop numbers are read as int16, so keep ``n_stops``
+    below 32768), and PROJECTFLG set on about a fifth of the paths.
+    Records are generated ``chunk_rows`` at a time, so tens of millions of
+    records can be written without holding them in memory.
+    """
+    write_dcb(f'{bin_path[:-4]}.dcb')
+    file_struct, _ = retrieve_binary_structure(bin_path)
+    rng = np.random.default_rng(seed)
+    taz = np.array([label.ljust(12) for label in taz_labels(n_taz)], dtype='S12')
+
+    with open(bin_path, 'wb') as f:
+        for start in range(0, n_records, chunk_rows):
+            n = min(chunk_rows, n_records - start)
+            arr = np.zeros(n, dtype=file_struct)
+
+            arr['MODE'] = 3
+            arr['ITAZ'] = taz[(np.arange(start, start + n, dtype=np.int64) * n_taz) // n_records]
+            arr['JTAZ'] = taz[rng.integers(0, n_taz, n)]
+            for name in ('ACC_TIME', 'EGR_TIME', 'WT1_TIME', 'FG__TIME'):
+                arr[name] = rng.gamma(2.0, 6.0, n).astype(np.float32)
+
+            legs = rng.integers(1, 5, n)
+            arr['N__BOARD'] = legs
+            arr['XFW_TIME'] = np.where(legs > 1, rng.gamma(1.5, 3.0, n), 0)
+            arr['WTX_TIME'] = np.where(legs > 1, rng.gamma(1.5, 4.0, n), 0)
+            for leg in range(1, 5):
+                used = legs >= leg
+                arr[f'ISTOP_NO-0{leg}'] = np.where(used, rng.integers(1, n_stops, n), 0)
+                arr[f'JSTOP_NO-0{leg}'] = np.where(used, rng.integers(1, n_stops, n), 0)
+                arr[f'MODE-0{leg}'] = np.where(used, rng.integers(1, 5, n), 0)
+                arr[f'TRIP_NO-0{leg}'] = np.where(used, rng.integers(1, n_trips, n), 0)
+            arr['PROJECTFLG'] = rng.random(n) < 0.2
+
+            arr.tofile(f)
+
+
+def write_stops(stops_path, n_stops=500):
+    with open(stops_path, 'w') as f:
+        f.write('stop_no,orig_stop_id,stop_name,lat,lon\n')
+        for i in range(1, n_stops):
+            f.write(f'{i},S{i:05d},"Stop {i} & Main St",30.{i % 1000:03d},-97.{i % 997:03d}\n')
+
+
+def write_trips(trips_path, n_trips=2000, n_routes=40):
+    right_aligned = {'trip_no', 'trip_id', 'route_no', 'route_id', 'route_type', 'route_used',
+                     'begin_time', 'end_time', 'mileage'}
+
+    def record(values):
+        fields = []
+        for name, width, value in zip(_TRIP_FIELDS, _TRIP_WIDTHS, values):
+            value = str(value)[:width]
+            fields.append(value.rjust(width) if name in right_aligned else value.ljust(width))
+        return ''.join(fields) + '\n'
+
+    with open(trips_path, 'w') as f:
+        f.write(record(_TRIP_FIELDS))
+        for i in range(1, n_trips):
+            route = i % n_routes + 1
+            f.write(record([i, ',', i, ',', f'T{i}_weekday', route, ',', route, ',', f'R{route}', ',', f'{route}L',
+                            ',', f'Route {route} long name, with comma', ',', '', ',', 3, ',', 1, ',',
+                            21600 + 60 * (i % 600), ',', 25200 + 60 * (i % 600), ',', 12]))
+
+
+def _district_table(label, n_districts, rng):
+    names = [f'D{j}' for j in range(n_districts)]
+    lines = [f'Table{label:>9s}', ' Transit trips from district to district', '', ' Scenario', '',
+             f'{"Idist":>8s}' + ''.join(f'{name:>8s}' for name in names) + f'{"Total":>8s}',
+             ' -------' * (n_districts + 2)]
+    trips = rng.integers(0, 500, (n_districts, n_districts))
+    for name, row in zip(names, trips):
+        # STOPS prints small flows as a dash
+        cells = ''.join(f'{"-" if value < 50 else value:>8}' for value in row)
+        lines.append(f'{name:>8s}{cells}{row.sum():>8d}')
+    lines += ['Total', '']
+    return lines
+
+
+def _route_table(n_routes, rng):
+    lines = [f'Table{"10.01":>9s}', ' Route boardings', '', '', '', '', '',
+             f'{"Route ID":<25s}{"Route Name":<30s}' + ''.join(f'{f"c{k}":>10s}' for k in range(13)),
+             '-' * 185]
+    for i in range(n_routes):
+        values = rng.integers(0, 9999, 13)
+        cells = ''.join(f'{"-" if value < 300 else value:>10}' for value in values)
+        lines.append(f'{f"{i}&R{i}":<25s}{f"--{i}-Route {i}":<30s}{cells}')
+    lines += ['               Total', '']
+    return lines
+
+
+def _station_table(n_stations, rng):
+    lines = [f'Table{"9.01":>9s}'] + [' Station boardings by access mode'] * 7
+    lines.append(f'{"Stop":>8s} {"Station":<30s}' + ''.join(f'{f"c{k}":>8s}' for k in range(15)))
+    for i in range(n_stations):
+        values = rng.integers(0, 999, 15)
+        cells = ''.join(f'{"-" if value < 100 else value:>8}' for value in values)
+        # Station names without spaces keep read_fwf's column inference stable
+        lines.append(f'{f"S{i}":>8s} {f"Station_{i}":<30s}{cells}')
+    return lines + ['\x00']
+
+
+def write_report(result_file_path, n_districts=20, n_routes=50, n_stations=100, seed=0):
+    """Write a synthetic STOPS Results file.
+
+    It holds station boardings (9.01), route boardings (10.01) and all 48
+    district-to-district tables (30.01 ... 1017.01), laid out so that
+    ``parse_table`` reads them like a real report.
+    """
+    rng = np.random.default_rng(seed)
+    lines = ['STOPS synthetic results', '', f'Table{"1.00":>9s}', ' Contents', '']
+    lines += _station_table(n_stations, rng)
+    lines += _route_table(n_routes, rng)
+    n_tables = _DISTRICT_SCENARIOS * _DISTRICT_PURPOSES * _DISTRICT_AUTO_OWNERSHIP
+    for position in range(n_tables):
+        lines += _district_table(f'{30 + 21 * position}.01', n_districts, rng)
+
+    with open(result_file_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def write_run(directory, n_districts=20, n_routes=50, n_stations=100, n_records=1_000_000, n_taz=3000,
+              n_stops=500, n_trips=2000, skims=(('build', 'fg', 'walk', 'pk'),), cores=('s19', 's19', 'b19'),
+              seed=0):
+    """Write a synthetic STOPS run under ``directory`` and return its Results file path.
+
+    Creates ``Reports/`` with a Results file named after the existing,
+    no-build and build ``cores``, and ``Skims/`` with one skim per
+    ``(scenario, mode, access, period)`` in ``skims`` plus the stops.txt
+    and trips.txt of each scenario/mode/period.
+    """
+    os.makedirs(os.path.join(directory, 'Reports'), exist_ok=True)
+    os.makedirs(os.path.join(directory, 'Skims'), exist_ok=True)
+    result_file = os.path.join(directory, 'Reports', f'AC_{"#".join(cores)}_STOPSY2019Results.prn')
+    write_report(result_file, n_districts, n_routes, n_stations, seed)
+
+    for k, (scenario, mode, access, period) in enumerate(skims):
+        write_skim(f'{_root_skim_path(result_file, scenario, mode, access, period)}.bin', n_records, n_taz,
+                   n_stops, n_trips, seed + k)
+        lookup_root = _root_skim_path(result_file, scenario, mode, '', period)
+        write_stops(f'{lookup_root}stops.txt', n_stops)
+        write_trips(f'{lookup_root}trips.txt', n_trips)
+    return result_file
@@ -0,0 +1,123 @@
+import os
+import time
+
+from .reader import (_find_line_start, _line_starts, _map_file, _parse_table_buffer, _read_spans,
+                     _start_table_label, _table_parameters)
+
+
+class ReportTail:
+    """Parse tables from a Results file that STOPS is still writing.
+
+    Each ``poll`` scans only the complete lines appended since the previous
+    one and parses the tables whose end tag has appeared since, so polling
+    cost grows with new output rather than with file size. Tables are
+    reported as ``(label, DataFrame)`` pairs in the order they end in the
+    file; a label printed more than once is reported again with all of its
+    blocks so far, as ``parse_table`` would return it. ``on_table`` is
+    called with each pair as it is parsed.
+
+    If the file shrinks, it is assumed to have been rewritten and scanning
+    starts again from the beginning.
+    """
+
+    def __init__(self, result_file_path, table_labels=None, on_table=None):
+        self.result_file_path = result_file_path
+        self.table_labels = set(_table_parameters if table_labels is None else table_labels)
+        self.on_table = on_table
+        self.reset()
+
+    def __repr__(self):
+        return f'ReportTail({self.result_file_path!r}, offset={self.offset})'
+
+    def reset(self):
+        self.offset = 0
+        self.spans = {}
+        self.tables = {}
+        # label -> [block start, offset to resume the end tag search from, end or -1]
+        self._open_tables = {}
+
+    def poll(self, final=False):
+        """Parse the tables completed since the last poll and return them as a list.
+
+        With ``final=True`` the file is taken to be finished: a last line
+        without a newline is searched for end tags too, and tables still
+        waiting for their end tag run to the end of the file, as with
+        ``parse_table``.
+        """
+        if not os.path.exists(self.result_file_path):
+            return []
+        if os.path.getsize(self.result_file_path) < self.offset:
+            self.reset()
+
+        with open(self.result_file_path, 'rb') as result_file, _map_file(result_file) as data:
+            limit = len(data) if final else data.rfind(b'\n', self.offset) + 1
+            if limit <= self.offset and not (final and self._open_tables):
+                return []
+
+            completed = []
+            for offset in _line_starts(data, b'Table', self.offset, limit):
+                line_end = data.find(b'\n', offset, limit)
+                if line_end < 0:
+                    break
+                label = _start_table_label(data[offset:line_end + 1])
+                if label is None or label not in self.table_labels:
+                    continue
+
+                # Repeated headers inside an unfinished block are part of it
+                if label in self._open_tables:
+                    end = self._find_end(data, label, limit)
+                    if end < 0 or end > offset:
+                        continue
+                    completed.append(self._close(label, end))
+                self._open_tables[label] = [offset, offset, -1]
+
+            for label in list(self._open_tables):
+                end = self._find_end(data, label, limit)
+                if end < 0 and final:
+                    end = len(data)
+                if end >= 0:
+                    completed.append(self._close(label, end))
+
+            self.offset = limit
+
+            new_tables = []
+            for _, label, spans in sorted(completed, key=lambda item: item[0]):
+                df = _parse_table_buffer(_read_spans(data, spans), _table_parameters[label])
+                self.tables[label] = df
+                new_tables.append((label, df))
+                if self.on_table is not None:
+                    self.on_table(label, df)
+
+        return new_tables
+
+    def follow(self, interval=30, timeout=None):
+        """Poll every ``interval`` seconds, yielding each new ``(label, DataFrame)``.
+
+        Stops once ``timeout`` seconds pass without new tables, or never if
+        ``timeout`` is None.
+        """
+        last_table = time.monotonic()
+        while True:
+            new_tables = self.poll()
+            if new_tables:
+                last_table = time.monotonic()
+            yield from new_tables
+
+            if timeout is not None and time.monotonic() - last_table >= timeout:
+                return
+            time.sleep(interval)
+
+    def _find_end(self, data, label, limit):
+        block = self._open_tables[label]
+        if block[2] < 0:
+            tag = _table_parameters[label].end_table_tag.encode()
+            block[2] = _find_line_start(data, tag, block[1], limit)
+            if block[2] < 0:
+                # Only complete lines were searched, so no tag can straddle limit
+                block[1] = max(block[1], limit)
+        return block[2]
+
+    def _close(self, label, end):
+        start = self._open_tables.pop(label)[0]
+        self.spans.setdefault(label, []).append((start, end - start))
+        return end, label, list(self.spans[label])
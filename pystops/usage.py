@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from .skim_reader import _STOP_COLUMNS, _TRIP_COLUMNS, read_skim, read_trips
+
+KINDS = ('stop', 'trip', 'route')
+
+
+class UsageIndex:
+    """Inverted index from stops, trips and routes to the skim records that use them.
+
+    For each kind the index is CSR style: ``keys`` are the sorted stop
+    numbers, trip numbers or route ids that appear in any path leg, and
+    ``records[indptr[k]:indptr[k + 1]]`` are the sorted record ids (row
+    positions in the skim) whose path uses ``keys[k]``. A record is listed
+    once per key however many of its legs use it, so record counts are O-D
+    pair counts. ``itaz`` and ``jtaz`` hold each record's O-D pair.
+    """
+
+    def __init__(self, indexes, itaz, jtaz):
+        self._indexes = indexes
+        self.itaz = itaz
+        self.jtaz = jtaz
+
+    def __repr__(self):
+        sizes = ', '.join(f'{kind}s={len(self._indexes[kind][0])}' for kind in KINDS if kind in self._indexes)
+        return f'UsageIndex({len(self.itaz)} records, {sizes})'
+
+    def keys(self, kind):
+        return self._indexes[kind][0]
+
+    def records(self, kind, keys):
+        """Sorted ids of the records using any of ``keys`` (one key or a list)."""
+        index_keys, indptr, records = self._indexes[kind]
+        if np.ndim(keys) == 0:
+            keys = [keys]
+        positions = index_keys.get_indexer(keys)
+        positions = positions[positions >= 0]
+
+        if len(positions) == 1:
+            return records[indptr[positions[0]]:indptr[positions[0] + 1]]
+        # Concatenate the ranges indptr[k]:indptr[k + 1] of every key
+        first = indptr[positions]
+        counts = indptr[positions + 1] - first
+        offsets = np.cumsum(counts) - counts
+        return np.unique(records[np.repeat(first - offsets, counts) + np.arange(counts.sum())])
+
+    def pairs(self, kind, keys):
+        """O-D pairs whose path uses any of ``keys``, with their record ids as the index."""
+        records = self.records(kind, keys)
+        return pd.DataFrame({'ITAZ': self.itaz[records], 'JTAZ': self.jtaz[records]},
+                            index=pd.Index(records, name='record'))
+
+    def counts(self, kind):
+        """Number of O-D pairs using each stop, trip or route."""
+        index_keys, indptr, _ = self._indexes[kind]
+        return pd.Series(np.diff(indptr), index=index_keys, name='pairs')
+
+    def aggregate(self, kind, weights):
+        """Sum ``weights`` (one per skim record, e.g. O-D trips) over the records of each key."""
+        index_keys, indptr, records = self._indexes[kind]
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) != len(self.itaz):
+            raise ValueError(f'Expected {len(self.itaz)} weights, one per skim record, got {len(weights)}')
+        # Every key has at least one record, so no range is empty
+        totals = np.add.reduceat(weights[records], indptr[:-1]) if len(records) else np.zeros(0)
+        return pd.Series(totals, index=index_keys, name='total')
+
+    @classmethod
+    def build(cls, skim, trips=None):
+        """Index the stop and trip legs of ``skim``, and routes when ``trips`` is given.
+
+        ``skim`` is a ``read_skim`` frame with numbered (unnamed) legs;
+        ``trips`` is a ``read_trips`` table mapping trip_no to route_id.
+        """
+        stop_cols = [col for col in _STOP_COLUMNS if col in skim]
+        trip_cols = [col for col in _TRIP_COLUMNS if col in skim]
+
+        stops = np.column_stack([skim[col].to_numpy() for col in stop_cols]) if stop_cols else None
+        trip_nos = np.column_stack([skim[col].to_numpy() for col in trip_cols]) if trip_cols else None
+
+        indexes = {}
+        if stops is not None:
+            indexes['stop'] = _invert(stops, stops > 0, lambda keys: pd.Index(keys, name='stop_no'))
+        if trip_nos is not None:
+            indexes['trip'] = _invert(trip_nos, trip_nos > 0, lambda keys: pd.Index(keys, name='trip_no'))
+
+        if trip_nos is not None and trips is not None:
+            route_codes, routes = pd.factorize(trips['route_id'])
+            size = max(trips['trip_no'].to_numpy().max(initial=0), trip_nos.max(initial=0)) + 1
+            table = np.full(int(size), -1, dtype=np.int64)
+            table[trips['trip_no'].to_numpy()] = route_codes
+            leg_routes = table[np.clip(trip_nos, 0, None)]
+            indexes['route'] = _invert(leg_routes, (trip_nos > 0) & (leg_routes >= 0),
+                                       lambda codes: pd.Index(routes[codes], name='route_id'))
+
+        return cls(indexes, skim['ITAZ'].array, skim['JTAZ'].array)
+
+
+def _invert(legs, used, make_keys):
+    # One int64 per (key, record) pair, so a single sort groups records by
+    # key; legs that repeat a key within a record collapse to one pair
+    n_records = legs.shape[0]
+    rows = np.broadcast_to(np.arange(n_records, dtype=np.int64)[:, None], legs.shape)
+    pairs = np.sort(legs[used].astype(np.int64) * n_records + rows[used])
+    pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])] if len(pairs) else pairs
+
+    pair_keys = pairs // n_records
+    starts = np.flatnonzero(np.concatenate([[True], pair_keys[1:] != pair_keys[:-1]])) if len(pairs) else pairs
+    indptr = np.append(starts, len(pairs)).astype(np.int64)
+    return make_keys(pair_keys[starts]), indptr, pairs % n_records
+
+
+def build_usage_index(result_file, scenario='build', mode='fg', access='walk', period='pk'):
+    """Read the path legs of a skim and index them by stop, trip and route."""
+    columns = ['ITAZ', 'JTAZ'] + _STOP_COLUMNS + _TRIP_COLUMNS
+    skim = read_skim(result_file, scenario, mode, access, period, columns=columns, strings='category')
+    trips = read_trips(result_file, scenario, mode, period)
+    return UsageIndex.build(skim, trips)
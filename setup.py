@@ -3,4 +3,7 @@ setup(
     name="pySTOPS",
     version="0.1",
     packages=['pystops'],
+    entry_points={
+        'console_scripts': ['pystops=pystops.cli:main'],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+
+import pandas as pd
+import pytest
+
+import pystops
+from pystops import synthetic
+from pystops.cache import ResultCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = pystops.enable_cache(str(tmp_path / 'cache'))
+    yield cache
+    pystops.disable_cache()
+
+
+def _bump_mtime(path, seconds=1):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+def test_table_entry_invalidated_when_report_changes(cache, tmp_path):
+    report = str(tmp_path / 'results.prn')
+    synthetic.write_report(report, n_stations=50, seed=0)
+    first = pystops.parse_table(report, '9.01')
+    pd.testing.assert_frame_equal(pystops.parse_table(report, '9.01'), first)
+
+    # Same size, only the modification time tells the versions apart
+    size = os.path.getsize(report)
+    synthetic.write_report(report, n_stations=50, seed=1)
+    assert os.path.getsize(report) == size
+    _bump_mtime(report)
+
+    pystops.disable_cache()
+    expected = pystops.parse_table(report, '9.01')
+    pystops.enable_cache(cache.directory)
+    assert not expected.equals(first)
+    pd.testing.assert_frame_equal(pystops.parse_table(report, '9.01'), expected)
+    assert len(cache.entries()) == 1
+
+
+def test_skim_entry_invalidated_when_lookup_changes(cache, tmp_path):
+    result_file = synthetic.write_run(str(tmp_path), n_records=500, n_taz=20, n_stops=40, n_trips=80)
+    first = pystops.read_skim(result_file, apply_stop_name=True)
+
+    stops_path = f'{pystops.skim_reader._root_skim_path(result_file, access="")}stops.txt'
+    with open(stops_path) as f:
+        text = f.read()
+    with open(stops_path, 'w') as f:
+        f.write(text.replace('Main St', 'Elm Rd.'))
+    _bump_mtime(stops_path)
+
+    named = pystops.read_skim(result_file, apply_stop_name=True)
+    assert named['ISTOP_NO-01_name'].str.endswith('Elm Rd.').all()
+    pd.testing.assert_frame_equal(named.drop(columns=[col for col in named if col.endswith('_name')]),
+                                  first.drop(columns=[col for col in first if col.endswith('_name')]))
+
+
+def test_least_recently_used_entries_evicted(tmp_path):
+    sources = []
+    for name in 'abc':
+        path = tmp_path / f'{name}.txt'
+        path.write_text(name)
+        sources.append(str(path))
+    frame = pd.DataFrame({'x': range(1000)})
+
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=2 ** 40)
+    cache.store('table', [sources[0]], {}, frame)
+    cache.store('table', [sources[1]], {}, frame)
+    entry_size = cache.size() // 2
+    for age, source in zip((100, 50), sources):
+        path = os.path.join(cache.directory, cache._entry_name('table', [source], {})[1])
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - age * 10 ** 9))
+
+    # Reading a makes b the least recently used entry
+    assert cache.load('table', [sources[0]], {}) is not None
+    cache.max_bytes = int(2.5 * entry_size)
+    cache.store('table', [sources[2]], {}, frame)
+
+    assert cache.size() <= cache.max_bytes
+    assert cache.load('table', [sources[0]], {}) is not None
+    assert cache.load('table', [sources[1]], {}) is None
+    assert cache.load('table', [sources[2]], {}) is not None
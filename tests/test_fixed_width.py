@@ -0,0 +1,81 @@
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from pystops.reader import TableDef, _read_fixed_width
+
+# Cell values seen in STOPS tables plus the awkward cases read_fwf handles
+MIXED_TOKENS = ['12', '-', '3.5', 'abc', 'NA', 'N/A', 'NULL', 'nan', '', 'True', 'False', '007', '-4', '1e3',
+                'x y', 'Total', 'inf', '\x0c']
+
+
+def _random_table(rng):
+    n_columns = rng.randint(1, 6)
+    widths = [rng.randint(2, 8) for _ in range(n_columns)]
+    kinds = [rng.choice(['int', 'float', 'mixed_number', 'str', 'bool', 'dash', 'mixed']) for _ in range(n_columns)]
+
+    lines = [rng.choice(['', 'Table  1.01', '  title text', '   ', '\t']) for _ in range(rng.randint(0, 4))]
+    lines.append(''.join(rng.choice(['a', 'b', '', 'a', 'Idist', '1']).rjust(width) for width in widths))
+    for _ in range(rng.randint(1, 12)):
+        if rng.random() < 0.1:
+            lines.append(rng.choice(['', '   ', '\t  ']))
+            continue
+
+        cells = []
+        for kind, width in zip(kinds, widths):
+            if kind == 'int':
+                value = str(rng.randint(-50, 500))
+            elif kind == 'float':
+                value = rng.choice([f'{rng.random() * 100:.2f}', ''])
+            elif kind == 'mixed_number':
+                value = rng.choice([str(rng.randint(0, 99)), f'{rng.random() * 10:.1f}'])
+            elif kind == 'bool':
+                value = rng.choice(['True', 'False'])
+            elif kind == 'str':
+                value = rng.choice(['abc', 'NA', 'q', ''])
+            elif kind == 'dash':
+                value = rng.choice([str(rng.randint(0, 99)), '-'])
+            else:
+                value = rng.choice(MIXED_TOKENS)
+            value = value[:width - 1]
+            cells.append(value.rjust(width) if rng.random() < 0.8 else value.ljust(width))
+
+        line = ''.join(cells)
+        if rng.random() < 0.1:
+            line = line.rstrip()
+        if rng.random() < 0.05:
+            line += '   extra'
+        lines.append(line)
+    return '\n'.join(lines) + rng.choice(['\n', '']), widths
+
+
+def _outcome(read):
+    try:
+        return read()
+    except Exception as e:
+        return type(e).__name__
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_matches_read_fwf(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        text, widths = _random_table(rng)
+        skip_rows = rng.randint(0, 4)
+        widths = widths if rng.random() < 0.3 else None
+        table_def = TableDef('x', 'END', skip_rows=skip_rows, widths=widths)
+
+        def read():
+            names, columns = _read_fixed_width(text, table_def)
+            df = pd.DataFrame(dict(enumerate(columns)))
+            df.columns = names
+            return df
+
+        expected = _outcome(lambda: pd.read_fwf(io.StringIO(text), widths=widths, skiprows=skip_rows))
+        got = _outcome(read)
+        if isinstance(expected, str) or isinstance(got, str):
+            assert got == expected, text
+        else:
+            pd.testing.assert_frame_equal(got, expected, obj=repr(text))
@@ -0,0 +1,16 @@
+import pystops
+from pystops import synthetic
+
+
+def test_table_and_skim_stages_summarised_apart(tmp_path):
+    result_file = synthetic.write_run(str(tmp_path), n_stations=30, n_records=500, n_taz=20, n_stops=40,
+                                      n_trips=80)
+
+    with pystops.profile() as profiler:
+        pystops.parse_table(result_file, '9.01')
+        pystops.read_skim(result_file)
+    summary = profiler.summary()
+
+    assert summary.loc['table_frame', 'rows'] == 30
+    assert summary.loc['skim_frame', 'rows'] == 500
+    assert summary.index.is_unique
@@ -0,0 +1,116 @@
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pystops
+from pystops import synthetic
+
+# Data rows of synthetic._station_table follow its eight title lines and the column header,
+# each with a 39 character stop/station prefix and then 15 cells of 8 characters
+FIRST_ROW, PREFIX, CELL = 9, 39, 8
+EXIST_ALL, BLD_ALL = 4, 14
+
+
+@pytest.fixture
+def station_table():
+    return synthetic._station_table(3, np.random.default_rng(0))
+
+
+def _set_cell(lines, row, column, value):
+    line = lines[FIRST_ROW + row]
+    start = PREFIX + CELL * column
+    lines[FIRST_ROW + row] = f'{line[:start]}{value:>8}{line[start + CELL:]}'
+
+
+def _write_report(path, lines):
+    with open(path, 'w') as f:
+        f.write('\n'.join(['STOPS results', ''] + lines) + '\n')
+    return str(path)
+
+
+def test_station_dashes_become_zero(tmp_path, station_table):
+    _set_cell(station_table, 1, EXIST_ALL, '-')
+    _set_cell(station_table, 2, BLD_ALL, 142)
+    report = _write_report(tmp_path / 'results.prn', station_table)
+
+    table = pystops.parse_table(report, '9.01')
+
+    assert list(table['stop_id']) == ['S0', 'S1', 'S2']
+    assert table['exist_all'].dtype == np.int64
+    assert table.loc[1, 'exist_all'] == 0
+    assert table.loc[2, 'bld_all'] == 142
+
+
+@pytest.mark.parametrize('cell', ['', 'NA', 'inf'])
+def test_station_non_finite_int_cell_raises(tmp_path, station_table, cell):
+    _set_cell(station_table, 1, EXIST_ALL, cell)
+    report = _write_report(tmp_path / 'results.prn', station_table)
+
+    with pytest.raises(pd.errors.IntCastingNaNError):
+        pystops.parse_table(report, '9.01')
+
+
+def test_non_utf8_line_starting_with_table(tmp_path, station_table):
+    path = tmp_path / 'results.prn'
+    with open(path, 'wb') as f:
+        f.write(b'Table of r\xe9sultats\n')
+        f.write(b'Table    \xe9.01\n')
+        f.write(('\n'.join(station_table) + '\n').encode())
+
+    table = pystops.parse_table(str(path), '9.01')
+
+    expected = pystops.parse_table(_write_report(tmp_path / 'plain.prn', station_table), '9.01')
+    pd.testing.assert_frame_equal(table, expected)
+    assert len(table) == 3
+
+
+def test_parse_reports_keeps_runs_with_the_same_build_apart(tmp_path, station_table):
+    names = ['AC_s19#s19#b19_STOPSY2019Results.prn', 'AC_s45#s45#b19_STOPSY2045Results.prn']
+    reports = [_write_report(tmp_path / name, station_table) for name in names]
+
+    tables = pystops.parse_reports(reports, '9.01', use_processes=False)
+
+    assert list(tables.index.get_level_values('alternative').unique()) == \
+        ['AC_s19#s19#b19_STOPSY2019Results', 'AC_s45#s45#b19_STOPSY2045Results']
+    assert list(tables.index.names[:4]) == ['alternative', 'exist', 'nobuild', 'build']
+    assert list(tables.xs('s45', level='exist')['stop_id']) == ['S0', 'S1', 'S2']
+    assert len(tables) == 6
+
+
+def test_parse_reports_workers_use_cache_and_profiler(tmp_path, monkeypatch, station_table):
+    # Spawned workers start without the parent's globals, unlike forked ones
+    monkeypatch.setattr(pystops.reader, 'ProcessPoolExecutor',
+                        functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn')))
+    names = ['AC_s19#s19#b19_STOPSY2019Results.prn', 'results.prn']
+    reports = [_write_report(tmp_path / name, station_table) for name in names]
+
+    cache = pystops.enable_cache(str(tmp_path / 'cache'))
+    try:
+        with pystops.profile() as profiler:
+            tables = pystops.parse_reports(reports, '9.01', max_workers=2)
+    finally:
+        pystops.disable_cache()
+
+    assert len(cache.entries()) == 2
+    assert (profiler.to_frame()['stage'] == 'parse_tables').sum() == 2
+    assert (tables.xs('results', level='alternative').index.get_level_values('build') == '').all()
+
+
+def test_parse_reports_duplicate_alternatives_raise(tmp_path, station_table):
+    reports = []
+    for directory in ('a', 'b'):
+        (tmp_path / directory).mkdir()
+        reports.append(_write_report(tmp_path / directory / 'AC_s19#s19#b19_STOPSY2019Results.prn',
+                                     station_table))
+
+    with pytest.raises(ValueError, match='share the alternative names'):
+        pystops.parse_reports(reports, '9.01', use_processes=False)
+
+
+def test_parse_reports_empty_glob_raises(tmp_path):
+    with pytest.raises(FileNotFoundError, match='No Results files match'):
+        pystops.parse_reports(str(tmp_path / '*Results.prn'), '9.01')
@@ -0,0 +1,71 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pystops
+from pystops import synthetic
+
+SKIMS = (('nobuild', 'fg', 'walk', 'pk'), ('build', 'fg', 'walk', 'pk'))
+
+
+@pytest.fixture
+def result_file(tmp_path):
+    return synthetic.write_run(str(tmp_path), n_records=2_000, n_taz=60, n_stops=40, n_trips=80, skims=SKIMS)
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_read_all_skims_compact_shares_dictionary(result_file, use_processes):
+    skims = pystops.read_all_skims(result_file, modes=('fg',), accesses=('walk',), periods=('pk',),
+                                   compact=True, apply_stop_name=True, use_processes=use_processes)
+    dictionary = pystops.skim_dictionary(result_file)
+
+    assert set(skims) == set(SKIMS)
+    for (scenario, mode, access, period), skim in skims.items():
+        expected = pystops.read_skim(result_file, scenario, mode, access, period, apply_stop_name=True)
+        for col in ('ITAZ', 'JTAZ'):
+            np.testing.assert_array_equal(dictionary.decode('taz', skim[col]), expected[col])
+        np.testing.assert_array_equal(dictionary.decode('stops', skim['ISTOP_NO-01']), expected['ISTOP_NO-01'])
+        np.testing.assert_array_equal(dictionary.decode('trips', skim['TRIP_NO-01']), expected['TRIP_NO-01'])
+
+
+def test_read_all_skims_from_store_without_raw_skims(result_file, tmp_path):
+    store = str(tmp_path / 'store')
+    skim_directory = os.path.join(os.path.dirname(os.path.dirname(result_file)), 'Skims')
+    pystops.convert_skims(skim_directory, store)
+    expected = {key: pystops.read_skim(result_file, *key) for key in SKIMS}
+    shutil.rmtree(skim_directory)
+
+    skims = pystops.read_all_skims(result_file, modes=('fg',), accesses=('walk',), periods=('pk',), store=store)
+
+    assert set(skims) == set(SKIMS)
+    for key, skim in skims.items():
+        pd.testing.assert_frame_equal(skim, expected[key])
+
+
+def test_empty_skim_by_origins(tmp_path):
+    result_file = synthetic.write_run(str(tmp_path), n_records=0, n_taz=60, skims=SKIMS)
+
+    skim = pystops.read_skim(result_file, origins=['09001$0001'])
+    comparison = pystops.compare_skims(result_file, chunk_origins=10)
+
+    assert skim.shape == (0, 28)
+    assert comparison.status().sum() == 0
+
+
+def test_skim_index_rebuilt_when_skim_changes(result_file):
+    bin_path = f'{pystops.skim_reader._root_skim_path(result_file)}.bin'
+    origin = synthetic.taz_labels(60)[5]
+    before = pystops.read_skim(result_file, origins=[origin])
+
+    synthetic.write_skim(bin_path, 3_000, n_taz=60, n_stops=40, n_trips=80, seed=7)
+    os.utime(bin_path, ns=(os.stat(bin_path).st_atime_ns, os.stat(bin_path).st_mtime_ns + 10 ** 9))
+    after = pystops.read_skim(result_file, origins=[origin])
+
+    full = pystops.read_skim(result_file)
+    expected = full[full['ITAZ'] == origin].reset_index(drop=True)
+    assert len(after) != len(before)
+    pd.testing.assert_frame_equal(after, expected)
+    assert pystops.skim_index(bin_path).stamp == pystops.skim_reader._file_stamp(bin_path)
@@ -0,0 +1,32 @@
+import os
+
+import pandas as pd
+
+import pystops
+from pystops import synthetic
+from pystops.store import load_manifest
+
+SKIMS = (('nobuild', 'fg', 'walk', 'pk'), ('build', 'fg', 'walk', 'pk'))
+
+
+def test_convert_skims_round_trip_and_prune(tmp_path):
+    result_file = synthetic.write_run(str(tmp_path / 'run'), n_records=2_000, n_taz=60, n_stops=40, n_trips=80,
+                                      skims=SKIMS)
+    skim_directory = str(tmp_path / 'run' / 'Skims')
+    store = str(tmp_path / 'store')
+
+    written = pystops.convert_skims(skim_directory, store)
+    assert len(written) == 4
+    assert pystops.convert_skims(skim_directory, store) == []
+    for key in SKIMS:
+        pd.testing.assert_frame_equal(pystops.read_skim(result_file, *key, store=store),
+                                      pystops.read_skim(result_file, *key))
+
+    bin_path = f'{pystops.skim_reader._root_skim_path(result_file, *SKIMS[0])}.bin'
+    partition = os.path.relpath(pystops.skim_reader._store_partition(store, result_file, *SKIMS[0]), store)
+    os.remove(bin_path)
+    pystops.convert_skims(skim_directory, store)
+
+    assert partition not in load_manifest(store)
+    assert not os.path.exists(os.path.join(store, partition))
+    assert len(load_manifest(store)) == 3
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+import pystops
+from pystops import synthetic
+
+
+def _parse_all(report, labels):
+    return {label: pystops.parse_table(report, label) for label in labels}
+
+
+def test_tail_chunked_appends_match_parse_table(tmp_path):
+    full = str(tmp_path / 'full.prn')
+    synthetic.write_report(full, n_districts=8, n_routes=20, n_stations=30)
+    with open(full, 'rb') as f:
+        data = f.read()
+
+    report = str(tmp_path / 'results.prn')
+    open(report, 'wb').close()
+    tail = pystops.ReportTail(report)
+    rng = np.random.default_rng(0)
+    tables = {}
+    offset = 0
+    while offset < len(data):
+        size = int(rng.integers(1, 3001))
+        with open(report, 'ab') as f:
+            f.write(data[offset:offset + size])
+        offset += size
+        tables.update(tail.poll())
+    tables.update(tail.poll(final=True))
+
+    assert len(tables) == 50
+    for label, expected in _parse_all(full, tables).items():
+        pd.testing.assert_frame_equal(tables[label], expected, obj=label)
+
+
+def test_tail_final_poll_closes_unterminated_table(tmp_path):
+    full = str(tmp_path / 'full.prn')
+    synthetic.write_report(full, n_districts=8, n_routes=20, n_stations=30)
+    with open(full, 'rb') as f:
+        data = f.read()
+    # Cut the report inside the last district table, mid-line
+    cut = data.rfind(b'\n', 0, data.rfind(b'Table') + 200) + 5
+    report = str(tmp_path / 'results.prn')
+    with open(report, 'wb') as f:
+        f.write(data[:cut])
+
+    tail = pystops.ReportTail(report)
+    tables = dict(tail.poll())
+    open_labels = set(tail._open_tables)
+    assert len(open_labels) == 1 and not open_labels & set(tables)
+
+    final = dict(tail.poll(final=True))
+    assert set(final) == open_labels
+    (label, table), = final.items()
+    pd.testing.assert_frame_equal(table, pystops.parse_table(report, label))
+
+
+def test_tail_resets_when_file_shrinks(tmp_path):
+    report = str(tmp_path / 'results.prn')
+    synthetic.write_report(report, n_stations=100)
+    tail = pystops.ReportTail(report, table_labels=['9.01', '10.01'])
+    assert len(tail.poll()) == 2
+
+    synthetic.write_report(report, n_stations=10, seed=1)
+    tables = dict(tail.poll())
+
+    assert set(tables) == {'9.01', '10.01'}
+    assert len(tables['9.01']) == 10
+    for label, expected in _parse_all(report, tables).items():
+        pd.testing.assert_frame_equal(tables[label], expected, obj=label)
@@ -0,0 +1,25 @@
+import pystops
+from pystops import synthetic
+
+
+def test_usage_index_of_empty_skim(tmp_path):
+    result_file = synthetic.write_run(str(tmp_path), n_records=0, n_taz=60, n_stops=40, n_trips=80)
+
+    usage = pystops.build_usage_index(result_file)
+
+    for kind in ('stop', 'trip', 'route'):
+        assert len(usage.keys(kind)) == 0
+        assert usage.counts(kind).sum() == 0
+    assert len(usage.pairs('route', ['R1'])) == 0
+
+
+def test_usage_counts_match_skim(tmp_path):
+    result_file = synthetic.write_run(str(tmp_path), n_records=2_000, n_taz=60, n_stops=40, n_trips=80)
+    skim = pystops.read_skim(result_file)
+
+    usage = pystops.build_usage_index(result_file)
+
+    legs = skim[[f'ISTOP_NO-0{leg}' for leg in range(1, 5)] + [f'JSTOP_NO-0{leg}' for leg in range(1, 5)]]
+    uses_stop = legs.eq(7).any(axis=1)
+    assert usage.counts('stop')[7] == uses_stop.sum()
+    assert list(usage.records('stop', 7)) == list(skim.index[uses_stop])